@@ -0,0 +1,224 @@
+# api_server.py
+#
+# Headless HTTP/JSON eligibility service, running alongside the Streamlit UI.
+#
+#   python api_server.py --port 8600
+#   python api_server.py --port 8600 --workers 4     pre-forked workers sharing the listening socket
+#
+#   POST /eligibility        {"credit_score": 700, "credit_limit": 5000, "credit_history": 12,
+#                             "income_requirement": 50000}   or   {"user_id": 42}
+#                            add "ranked": true for best-first results with margins and near misses
+#   POST /eligibility/batch  {"applicants": [{...thresholds...}, ...]}
+#   POST /predict            {...Final_dataset.csv features...}  or  {"applicants": [{...}, ...]}
+#                            or  {"user_id": 42} for the features kept in the feature store
+#   POST /admin/invalidate   reload the card catalog (X-Admin-Token: <CACHE_ADMIN_TOKEN>)
+#   GET  /metrics            per-query statistics collected when QUERY_TRACE=1
+#
+# Eligibility and prediction run on the in-memory catalog and model on the event loop,
+# database lookups go through the asyncio repository, and large batches and catalog
+# reloads run on a thread pool sized like the connection pool. With FEATURE_STORE_DIR set,
+# a user's thresholds and attributes are read from the memory-mapped feature store.
+
+import argparse
+import json
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import tornado.httpserver
+import tornado.ioloop
+import tornado.netutil
+import tornado.process
+import tornado.web
+
+import approval_model
+import async_repository
+import card_catalog
+import db
+import feature_store
+import query_trace
+from batch_eligibility import eligibility_matrix
+
+THRESHOLD_FIELDS = ("credit_score", "credit_limit", "credit_history", "income_requirement")
+CACHE_ADMIN_TOKEN = os.environ.get("CACHE_ADMIN_TOKEN")
+
+# Batches larger than this are evaluated off the event loop
+INLINE_BATCH_LIMIT = 1000
+
+executor = ThreadPoolExecutor(max_workers=db.POOL_MAX_SIZE)
+
+
+class BadRequest(tornado.web.HTTPError):
+    def __init__(self, message):
+        super().__init__(400, reason=message)
+
+
+def parse_thresholds(data):
+    if not isinstance(data, dict):
+        raise BadRequest("Applicants must be JSON objects")
+    missing = [field for field in THRESHOLD_FIELDS if data.get(field) is None]
+    if missing:
+        raise BadRequest("Missing fields: {}".format(", ".join(missing)))
+    try:
+        values = [float(data[field]) for field in THRESHOLD_FIELDS]
+    except (TypeError, ValueError):
+        raise BadRequest("Threshold fields must be numbers")
+    # float() accepts "NaN" and "Infinity", which no threshold comparison should see
+    if not all(math.isfinite(value) for value in values):
+        raise BadRequest("Threshold fields must be finite numbers")
+    return values
+
+
+# Function to check one /predict applicant: known feature names, numbers for the numeric
+# features and strings for the categorical ones; omitted features use the model's defaults
+def parse_applicant(data):
+    if not isinstance(data, dict):
+        raise BadRequest("Applicants must be JSON objects")
+    unknown = sorted(set(data) - set(approval_model.NUMERIC_FEATURES) - set(approval_model.CATEGORICAL_FEATURES))
+    if unknown:
+        raise BadRequest("Unknown features: {}".format(", ".join(unknown)))
+    applicant = {}
+    for feature, value in data.items():
+        if value is None:
+            continue
+        if feature in approval_model.CATEGORICAL_FEATURES:
+            if not isinstance(value, str):
+                raise BadRequest("{} must be a string".format(feature))
+            applicant[feature] = value
+            continue
+        try:
+            applicant[feature] = float(value)
+        except (TypeError, ValueError):
+            raise BadRequest("{} must be a number".format(feature))
+        if not math.isfinite(applicant[feature]):
+            raise BadRequest("{} must be a finite number".format(feature))
+    return applicant
+
+
+def evaluate_applicants(applicants):
+    values = np.array([parse_thresholds(applicant) for applicant in applicants], dtype=float).reshape(-1, 4)
+    catalog = card_catalog.get_catalog()
+    names = np.asarray(catalog.names, dtype=object)
+    return [names[row].tolist() for row in eligibility_matrix(values, catalog)]
+
+
+class JSONHandler(tornado.web.RequestHandler):
+    def prepare(self):
+        try:
+            self.json = json.loads(self.request.body or b"{}")
+        except ValueError:
+            raise BadRequest("Body must be JSON")
+        if not isinstance(self.json, dict):
+            raise BadRequest("Body must be a JSON object")
+
+    def write_error(self, status_code, **kwargs):
+        self.finish({"error": self._reason})
+
+    def run_in_executor(self, function, *args):
+        return tornado.ioloop.IOLoop.current().run_in_executor(executor, function, *args)
+
+
+class EligibilityHandler(JSONHandler):
+    async def post(self):
+        if "user_id" in self.json:
+            store = feature_store.get_store()
+            thresholds = store.thresholds(self.json["user_id"]) if store else None
+            if thresholds is None or None in thresholds:
+                rows = await async_repository.retrive_credit_information(self.json["user_id"])
+                if not rows:
+                    raise tornado.web.HTTPError(404, reason="No credit details for this user")
+                thresholds = rows[0][1:5]
+        else:
+            thresholds = parse_thresholds(self.json)
+        catalog = card_catalog.get_catalog()
+        if self.json.get("ranked"):
+            self.write({"results": catalog.ranked_eligibility(*thresholds)})
+        else:
+            self.write({"eligible_cards": [card[0] for card in catalog.eligible_cards(*thresholds)]})
+
+
+class BatchEligibilityHandler(JSONHandler):
+    async def post(self):
+        applicants = self.json.get("applicants")
+        if not isinstance(applicants, list):
+            raise BadRequest("applicants must be a list")
+        if len(applicants) > INLINE_BATCH_LIMIT:
+            results = await self.run_in_executor(evaluate_applicants, applicants)
+        else:
+            results = evaluate_applicants(applicants)
+        self.write({"results": [{"eligible_cards": cards} for cards in results]})
+
+
+class PredictHandler(JSONHandler):
+    async def post(self):
+        model = approval_model.get_model()
+        if "user_id" in self.json:
+            store = feature_store.get_store()
+            if store is None:
+                raise BadRequest("The feature store is not enabled")
+            applicant = store.attributes(self.json["user_id"])
+            if not applicant:
+                raise tornado.web.HTTPError(
+                    404, reason="No stored features for this user; load them with feature_store.py --load-attributes")
+            self.write({"approval_probability": model.predict(applicant)})
+        elif "applicants" in self.json:
+            applicants = self.json["applicants"]
+            if not isinstance(applicants, list):
+                raise BadRequest("applicants must be a list")
+            self.write({"approval_probabilities": [model.predict(parse_applicant(applicant))
+                                                   for applicant in applicants]})
+        else:
+            self.write({"approval_probability": model.predict(parse_applicant(self.json))})
+
+
+class MetricsHandler(tornado.web.RequestHandler):
+    def get(self):
+        self.write({"query_trace_enabled": query_trace.ENABLED,
+                    "slow_query_ms": query_trace.SLOW_QUERY_MS,
+                    "queries": query_trace.stats()})
+
+
+class InvalidateHandler(JSONHandler):
+    async def post(self):
+        if not CACHE_ADMIN_TOKEN or self.request.headers.get("X-Admin-Token") != CACHE_ADMIN_TOKEN:
+            raise tornado.web.HTTPError(403, reason="Invalid admin token")
+        catalog = await self.run_in_executor(card_catalog.refresh_catalog)
+        self.write({"cards": len(catalog)})
+
+
+def make_app():
+    return tornado.web.Application([
+        (r"/eligibility", EligibilityHandler),
+        (r"/eligibility/batch", BatchEligibilityHandler),
+        (r"/predict", PredictHandler),
+        (r"/admin/invalidate", InvalidateHandler),
+        (r"/metrics", MetricsHandler),
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Credit card eligibility HTTP service")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("API_PORT", 8600)))
+    parser.add_argument("--address", default=os.environ.get("API_ADDRESS", ""))
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("API_WORKERS", 1)),
+                        help="worker processes (0: one per CPU)")
+    args = parser.parse_args()
+
+    sockets = tornado.netutil.bind_sockets(args.port, address=args.address)
+    if args.workers != 1:
+        # Fork before anything opens database connections or starts threads
+        tornado.process.fork_processes(args.workers)
+
+    # Load the catalog and model before accepting requests
+    card_catalog.get_catalog()
+    approval_model.get_model()
+
+    server = tornado.httpserver.HTTPServer(make_app())
+    server.add_sockets(sockets)
+    print("Eligibility service listening on port {} (pid {})".format(args.port, os.getpid()))
+    tornado.ioloop.IOLoop.current().start()
+
+
+if __name__ == "__main__":
+    main()
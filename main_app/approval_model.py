@@ -0,0 +1,236 @@
+# approval_model.py
+#
+# Logistic regression approval model trained on Final_dataset.csv.
+#
+#   python approval_model.py            train, report holdout accuracy and save the model
+#
+# The saved model folds feature scaling into the weights, so scoring one applicant
+# is a handful of multiplications and dictionary lookups (a few microseconds).
+# pandas is only imported by the training and DataFrame paths, so serving stays light.
+
+import argparse
+import json
+import math
+import os
+import threading
+
+import numpy as np
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+DATASET_PATH = os.environ.get("APPROVAL_DATASET", os.path.join(APP_DIR, "..", "Final_dataset.csv"))
+MODEL_PATH = os.environ.get("APPROVAL_MODEL", os.path.join(APP_DIR, "approval_model.json"))
+
+NUMERIC_FEATURES = ("Gender", "Age", "Debt", "Married", "BankCustomer", "YearsEmployed",
+                    "PriorDefault", "Employed", "CreditScore", "DriversLicense", "Income")
+CATEGORICAL_FEATURES = ("Industry", "Ethnicity", "Citizen")
+# Heavily skewed columns are modelled as log1p(value)
+LOG_FEATURES = ("Debt", "YearsEmployed", "CreditScore", "Income")
+TARGET = "Approved"
+
+
+class ApprovalModel:
+    def __init__(self, bias, numeric_weights, numeric_defaults, categorical_weights):
+        self.bias = bias
+        # {feature: weight} applied to the raw value (log1p for LOG_FEATURES)
+        self.numeric_weights = numeric_weights
+        # {feature: value} used when an applicant does not provide the feature
+        self.numeric_defaults = numeric_defaults
+        # {feature: {level: weight}}; unknown levels contribute nothing
+        self.categorical_weights = categorical_weights
+
+    # Probability of approval for one applicant given as a mapping of feature -> value
+    def predict(self, applicant):
+        z = self.bias
+        for feature, weight in self.numeric_weights.items():
+            value = applicant.get(feature)
+            if value is None:
+                value = self.numeric_defaults[feature]
+            elif feature in LOG_FEATURES:
+                value = math.log1p(max(float(value), 0.0))
+            z += weight * float(value)
+        for feature, levels in self.categorical_weights.items():
+            z += levels.get(applicant.get(feature), 0.0)
+        # Split on the sign of z so that exp() never overflows
+        if z >= 0:
+            return 1.0 / (1.0 + math.exp(-z))
+        e = math.exp(z)
+        return e / (1.0 + e)
+
+    # Probabilities for every row of a DataFrame
+    def predict_frame(self, frame):
+        import pandas as pd
+
+        z = np.full(len(frame), self.bias)
+        for feature, weight in self.numeric_weights.items():
+            if feature in frame:
+                values = pd.to_numeric(frame[feature], errors="coerce").to_numpy(dtype=float)
+                if feature in LOG_FEATURES:
+                    values = np.log1p(np.clip(values, 0.0, None))
+                values = np.where(np.isnan(values), self.numeric_defaults[feature], values)
+            else:
+                values = self.numeric_defaults[feature]
+            z += weight * values
+        for feature, levels in self.categorical_weights.items():
+            if feature in frame:
+                z += frame[feature].map(levels).fillna(0.0).to_numpy(dtype=float)
+        return sigmoid(z)
+
+    def to_dict(self):
+        return {
+            "bias": self.bias,
+            "numeric_weights": self.numeric_weights,
+            "numeric_defaults": self.numeric_defaults,
+            "categorical_weights": self.categorical_weights,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["bias"], data["numeric_weights"], data["numeric_defaults"],
+                   data["categorical_weights"])
+
+
+# Function to compute 1 / (1 + e^-z) elementwise without overflowing for large |z|
+def sigmoid(z):
+    e = np.exp(-np.abs(z))
+    return np.where(z >= 0, 1.0 / (1.0 + e), e / (1.0 + e))
+
+
+# Function to build the standardised design matrix used for training
+def encode_features(frame, levels=None):
+    numeric = frame[list(NUMERIC_FEATURES)].astype(float)
+    for feature in LOG_FEATURES:
+        numeric[feature] = np.log1p(numeric[feature].clip(lower=0))
+    if levels is None:
+        levels = {feature: sorted(frame[feature].astype(str).unique()) for feature in CATEGORICAL_FEATURES}
+    dummies = [
+        (frame[feature].astype(str).to_numpy()[:, np.newaxis] == np.asarray(levels[feature])[np.newaxis, :])
+        for feature in CATEGORICAL_FEATURES
+    ]
+    return numeric.to_numpy(), np.hstack(dummies).astype(float), levels
+
+
+# Function to fit L2-regularised logistic regression with Newton's method
+def fit_logistic_regression(X, y, l2=1.0, iterations=25, tolerance=1e-8):
+    X = np.hstack([np.ones((len(X), 1)), X])
+    weights = np.zeros(X.shape[1])
+    penalty = np.full(X.shape[1], l2)
+    penalty[0] = 0.0  # do not shrink the intercept
+    for _ in range(iterations):
+        p = sigmoid(X @ weights)
+        gradient = X.T @ (p - y) + penalty * weights
+        hessian = (X * (p * (1 - p))[:, np.newaxis]).T @ X + np.diag(penalty)
+        step = np.linalg.solve(hessian, gradient)
+        weights -= step
+        if np.abs(step).max() < tolerance:
+            break
+    return weights
+
+
+# Function to find the columns of the encode_features() dummy matrix that belong to `features`
+def categorical_columns(levels, features=CATEGORICAL_FEATURES):
+    columns, offset = [], 0
+    for feature in CATEGORICAL_FEATURES:
+        count = len(levels[feature])
+        if feature in features:
+            columns.extend(range(offset, offset + count))
+        offset += count
+    return columns
+
+
+# Function to train an ApprovalModel on a Final_dataset.csv-shaped DataFrame
+def train_model(frame, l2=1.0, categorical_features=CATEGORICAL_FEATURES):
+    numeric, dummies, levels = encode_features(frame)
+    return fit_encoded(numeric, dummies, levels, frame[TARGET].to_numpy(dtype=float), l2, categorical_features)
+
+
+# Function to train an ApprovalModel on rows already encoded by encode_features(),
+# using only the given categorical features
+def fit_encoded(numeric, dummies, levels, y, l2=1.0, categorical_features=CATEGORICAL_FEATURES):
+    categorical_features = [feature for feature in CATEGORICAL_FEATURES if feature in categorical_features]
+    means = numeric.mean(axis=0)
+    scales = numeric.std(axis=0)
+    scales[scales == 0] = 1.0
+    X = np.hstack([(numeric - means) / scales, dummies[:, categorical_columns(levels, categorical_features)]])
+    weights = fit_logistic_regression(X, y, l2=l2)
+
+    # Fold the standardisation into the weights: w * (x - mean) / scale = (w / scale) * x - w * mean / scale
+    n_numeric = len(NUMERIC_FEATURES)
+    numeric_weights = weights[1:1 + n_numeric] / scales
+    bias = weights[0] - float(numeric_weights @ means)
+    categorical_weights = {}
+    offset = 1 + n_numeric
+    for feature in categorical_features:
+        count = len(levels[feature])
+        categorical_weights[feature] = dict(zip(levels[feature], weights[offset:offset + count].tolist()))
+        offset += count
+    return ApprovalModel(
+        bias,
+        dict(zip(NUMERIC_FEATURES, numeric_weights.tolist())),
+        dict(zip(NUMERIC_FEATURES, means.tolist())),
+        categorical_weights,
+    )
+
+
+def load_dataset(path=DATASET_PATH):
+    import dataset_cache
+
+    return dataset_cache.load_dataset(path)
+
+
+def save_model(model, path=MODEL_PATH):
+    with open(path, "w") as f:
+        json.dump(model.to_dict(), f, indent=2)
+
+
+def load_model(path=MODEL_PATH):
+    with open(path) as f:
+        return ApprovalModel.from_dict(json.load(f))
+
+
+_model = None
+_model_lock = threading.Lock()
+
+
+# Function to get the process-wide model, training and saving it if no saved model exists
+def get_model():
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                if not os.path.exists(MODEL_PATH):
+                    save_model(train_model(load_dataset()))
+                _model = load_model()
+    return _model
+
+
+# Function to estimate the approval probability of one applicant
+def predict_approval(applicant):
+    return get_model().predict(applicant)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the approval model on Final_dataset.csv")
+    parser.add_argument("--dataset", default=DATASET_PATH)
+    parser.add_argument("--output", default=MODEL_PATH)
+    parser.add_argument("--l2", type=float, default=1.0)
+    parser.add_argument("--holdout", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    frame = load_dataset(args.dataset)
+    shuffled = frame.sample(frac=1.0, random_state=args.seed)
+    n_test = int(len(frame) * args.holdout)
+    test, train = shuffled.iloc[:n_test], shuffled.iloc[n_test:]
+    if n_test:
+        holdout_model = train_model(train, l2=args.l2)
+        predictions = holdout_model.predict_frame(test) >= 0.5
+        accuracy = (predictions == test[TARGET].to_numpy().astype(bool)).mean()
+        print("Holdout accuracy: {:.3f} ({} rows)".format(accuracy, n_test))
+
+    model = train_model(frame, l2=args.l2)
+    save_model(model, args.output)
+    print("Saved model trained on {} rows to {}".format(len(frame), args.output))
+
+
+if __name__ == "__main__":
+    main()
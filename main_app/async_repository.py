@@ -0,0 +1,259 @@
+# async_repository.py
+#
+# asyncio version of repository.py for the API and batch workloads. It uses psycopg2's
+# asynchronous connections driven by the event loop, so one worker can keep many lookups
+# in flight against Postgres without a thread per request. Queries and return values
+# match the functions of the same name in repository.py.
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+import psycopg2
+import psycopg2.extensions
+
+import card_catalog
+import db
+import query_trace
+from passwords import verify_password
+from repository import FEATURE_STORE_ENABLED, USER_RECORD_FIELDS, record_features
+
+
+# Function to wait until an asynchronous psycopg2 connection has finished its current operation
+async def _wait(conn):
+    loop = asyncio.get_running_loop()
+    while True:
+        state = conn.poll()
+        if state == psycopg2.extensions.POLL_OK:
+            return
+        ready = loop.create_future()
+        fd = conn.fileno()
+        if state == psycopg2.extensions.POLL_READ:
+            loop.add_reader(fd, ready.set_result, None)
+            remove = loop.remove_reader
+        elif state == psycopg2.extensions.POLL_WRITE:
+            loop.add_writer(fd, ready.set_result, None)
+            remove = loop.remove_writer
+        else:
+            raise psycopg2.OperationalError("poll() returned {}".format(state))
+        try:
+            await ready
+        finally:
+            remove(fd)
+
+
+class AsyncPool:
+    def __init__(self, max_size=db.POOL_MAX_SIZE, **settings):
+        self.settings = settings or db.DB_SETTINGS
+        self.max_size = max_size
+        self._idle = []
+        self._slots = asyncio.Semaphore(max_size)
+
+    async def _connect(self):
+        conn = psycopg2.connect(async_=True, **self.settings)
+        try:
+            await _wait(conn)
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    @asynccontextmanager
+    async def connection(self):
+        async with self._slots:
+            conn = None
+            while self._idle and conn is None:
+                conn = self._idle.pop()
+                if conn.closed:
+                    conn = None
+            if conn is None:
+                conn = await self._connect()
+            broken = False
+            try:
+                yield conn
+            except psycopg2.Error as e:
+                # A failed statement leaves the connection usable; a lost connection does not
+                broken = isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError))
+                raise
+            except BaseException:
+                # Anything else, including the task being cancelled while it waited for a
+                # result (e.g. the client went away), may leave a query in flight
+                broken = True
+                raise
+            finally:
+                if broken or conn.closed or conn.isexecuting():
+                    conn.close()
+                else:
+                    self._idle.append(conn)
+
+    async def _run(self, sql, params, fetch):
+        function = query_trace.caller() if query_trace.ENABLED else None
+        async with self.connection() as conn:
+            cursor = conn.cursor()
+            started = time.perf_counter()
+            cursor.execute(sql, params)
+            await _wait(conn)
+            if function:
+                query_trace.record(sql, time.perf_counter() - started, cursor.rowcount, function)
+            return fetch(cursor)
+
+    async def execute(self, sql, params=None):
+        return await self._run(sql, params, lambda cursor: cursor.rowcount)
+
+    async def fetchone(self, sql, params=None):
+        return await self._run(sql, params, lambda cursor: cursor.fetchone())
+
+    async def fetchall(self, sql, params=None):
+        return await self._run(sql, params, lambda cursor: cursor.fetchall())
+
+    async def close(self):
+        while self._idle:
+            self._idle.pop().close()
+
+
+# Same interface as AsyncPool for backends without an asynchronous driver (DB_BACKEND=sqlite):
+# each query runs on a worker thread through db.get_connection()
+class ExecutorPool:
+    def __init__(self, max_workers=db.POOL_MAX_SIZE):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def _query(self, sql, params, fetch, function):
+        with query_trace.calling(function), db.get_connection() as conn:
+            return fetch(conn.cursor().execute(sql, params))
+
+    async def _run(self, sql, params, fetch):
+        function = query_trace.caller() if query_trace.ENABLED else None
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._query, sql, params, fetch, function)
+
+    async def execute(self, sql, params=None):
+        return await self._run(sql, params, lambda cursor: cursor.rowcount)
+
+    async def fetchone(self, sql, params=None):
+        return await self._run(sql, params, lambda cursor: cursor.fetchone())
+
+    async def fetchall(self, sql, params=None):
+        return await self._run(sql, params, lambda cursor: cursor.fetchall())
+
+    async def close(self):
+        self._executor.shutdown()
+
+
+_pool = None
+
+
+# Function to get the event loop's shared pool
+def get_pool():
+    global _pool
+    if _pool is None:
+        _pool = ExecutorPool() if db.DB_BACKEND == "sqlite" else AsyncPool()
+    return _pool
+
+
+async def get_user_details(email_id):
+    return await get_pool().fetchone("SELECT * FROM profile WHERE email_id = %s", (email_id,))
+
+
+# Function to fetch many profiles in one round trip; returns {email_id: row}
+async def get_user_details_many(email_ids):
+    rows = await get_pool().fetchall("SELECT * FROM profile WHERE email_id = ANY(%s)", (list(email_ids),))
+    return {row[3]: row for row in rows}
+
+
+async def get_user_record(email_id):
+    row = await get_pool().fetchone("""
+        SELECT p.id, p.first_name, p.last_name, p.email_id, p.password,
+               u.minimum_credit_score, u.minimum_credit_limit,
+               u.minimum_credit_history, u.minimum_income_requirement
+        FROM profile p
+        LEFT JOIN user_details u ON u.user_id = p.id
+        WHERE p.email_id = %s
+    """, (email_id,))
+    if row is None:
+        return None
+    return dict(zip(USER_RECORD_FIELDS, row))
+
+
+async def verify_credentials(email_id, password):
+    user_data = await get_pool().fetchone(
+        "SELECT email_id, password FROM profile WHERE email_id = %s", (email_id,))
+    if not user_data:
+        return False
+    # pbkdf2 is CPU bound; keep it off the event loop
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, verify_password, password, user_data[1])
+
+
+# Function to mirror a committed user_details write into the feature store; the store takes a
+# file lock and writes to disk, so this runs off the event loop
+async def _record_features(user_id, *credit_information):
+    if FEATURE_STORE_ENABLED:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, record_features, user_id, *credit_information)
+
+
+async def retrive_credit_information(user_id):
+    existing_user = await get_pool().fetchall(
+        "SELECT * FROM user_details WHERE user_id = %s", (user_id,))
+    return existing_user if existing_user else None
+
+
+# Function to fetch the credit information of many users in one round trip; returns {user_id: row}
+async def retrive_credit_information_many(user_ids):
+    rows = await get_pool().fetchall(
+        "SELECT * FROM user_details WHERE user_id = ANY(%s)", (list(user_ids),))
+    return {row[0]: row for row in rows}
+
+
+async def create_credit_profile(user_id, credit_score, credit_limit, credit_history, income_requirement):
+    row = await get_pool().fetchone("""
+        INSERT INTO user_details (user_id, minimum_credit_score, minimum_credit_limit, minimum_credit_history, minimum_income_requirement)
+        VALUES (%s, %s, %s, %s, %s)
+        ON CONFLICT (user_id) DO NOTHING
+        RETURNING user_id
+    """, (user_id, credit_score, credit_limit, credit_history, income_requirement))
+    if row is not None:
+        await _record_features(user_id, credit_score, credit_limit, credit_history, income_requirement)
+    return row is not None
+
+
+async def update_user_credit_information(user_id, updated_credit_score, updated_credit_limit, updated_credit_history, updated_income_requirement):
+    try:
+        row = await get_pool().fetchone("""
+            UPDATE user_details
+            SET minimum_credit_score = %s,
+                minimum_credit_limit = %s,
+                minimum_credit_history = %s,
+                minimum_income_requirement = %s
+            WHERE user_id = %s
+            RETURNING user_id
+        """, (updated_credit_score, updated_credit_limit, updated_credit_history, updated_income_requirement, user_id))
+
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        return False
+    if row is not None:
+        await _record_features(user_id, updated_credit_score, updated_credit_limit,
+                               updated_credit_history, updated_income_requirement)
+    return row is not None
+
+
+async def delete_credit_information(user_id):
+    row = await get_pool().fetchone(
+        "DELETE FROM user_details WHERE user_id = %s RETURNING user_id", (user_id,))
+    if row is not None:
+        await _record_features(user_id)
+    return row is not None
+
+
+async def check_eligibility(user_id, credit_score, credit_limit, credit_history, income_requirement):
+    catalog = card_catalog.get_catalog()
+    return catalog.eligible_cards(credit_score, credit_limit, credit_history, income_requirement)
+
+
+# Function to check eligibility for many stored users at once; returns {user_id: eligible cards}
+async def check_eligibility_many(user_ids):
+    rows = await retrive_credit_information_many(user_ids)
+    catalog = card_catalog.get_catalog()
+    return {user_id: catalog.eligible_cards(*row[1:5]) for user_id, row in rows.items()}
@@ -0,0 +1,90 @@
+# batch_eligibility.py
+#
+# Run the credit card eligibility rules over many applicants at once.
+#
+#   python batch_eligibility.py applicants.csv -o eligible.csv --chunksize 50000
+
+import argparse
+import sys
+
+import numpy as np
+
+from card_catalog import get_catalog
+
+# Applicant threshold columns (same names as the user_details table),
+# in the order of the catalog's threshold columns
+APPLICANT_COLUMNS = (
+    "minimum_credit_score",
+    "minimum_credit_limit",
+    "minimum_credit_history",
+    "minimum_income_requirement",
+)
+
+DEFAULT_CHUNKSIZE = 10000
+CARD_SEPARATOR = "; "
+
+
+# Function to compute the applicants x cards eligibility matrix for one chunk
+def eligibility_matrix(values, catalog):
+    return catalog.eligibility_matrix(values)
+
+
+# Function to evaluate one DataFrame chunk and return it with the eligible cards attached
+def evaluate_chunk(chunk, catalog, columns=APPLICANT_COLUMNS):
+    missing = [column for column in columns if column not in chunk.columns]
+    if missing:
+        raise KeyError("Applicant data is missing columns: {}".format(", ".join(missing)))
+    import pandas as pd
+
+    values = chunk[list(columns)].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    matrix = eligibility_matrix(values, catalog)
+    names = np.asarray(catalog.names, dtype=object)
+    result = chunk.copy()
+    result["eligible_count"] = matrix.sum(axis=1)
+    result["eligible_cards"] = [CARD_SEPARATOR.join(names[row]) for row in matrix]
+    return result
+
+
+# Function to evaluate applicants in chunks.
+# `applicants` may be a DataFrame, a path to a CSV file or an iterable of DataFrame chunks;
+# results are yielded chunk by chunk so memory stays bounded by `chunksize`.
+def evaluate_batch(applicants, catalog=None, chunksize=DEFAULT_CHUNKSIZE, columns=APPLICANT_COLUMNS):
+    import pandas as pd
+
+    if catalog is None:
+        catalog = get_catalog()
+    if isinstance(applicants, pd.DataFrame):
+        chunks = (applicants.iloc[start:start + chunksize]
+                  for start in range(0, len(applicants), chunksize))
+    elif isinstance(applicants, str):
+        import dataset_cache
+
+        chunks = dataset_cache.iter_dataset(applicants, chunksize)
+    else:
+        chunks = applicants
+    for chunk in chunks:
+        yield evaluate_chunk(chunk, catalog, columns)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch credit card eligibility check")
+    parser.add_argument("input", help="CSV file with one applicant per row")
+    parser.add_argument("-o", "--output", help="CSV file to write (default: stdout)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--score-column", default=APPLICANT_COLUMNS[0])
+    parser.add_argument("--limit-column", default=APPLICANT_COLUMNS[1])
+    parser.add_argument("--history-column", default=APPLICANT_COLUMNS[2])
+    parser.add_argument("--income-column", default=APPLICANT_COLUMNS[3])
+    args = parser.parse_args(argv)
+
+    columns = (args.score_column, args.limit_column, args.history_column, args.income_column)
+    output = args.output or sys.stdout
+    applicants = 0
+    for i, result in enumerate(evaluate_batch(args.input, chunksize=args.chunksize, columns=columns)):
+        result.to_csv(output, mode="w" if i == 0 else "a", header=(i == 0), index=False)
+        applicants += len(result)
+    print("Evaluated {} applicants".format(applicants), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+# bench_flow.py
+#
+# Benchmark of the signup -> login -> eligibility flow against a local SQLite database
+# (DB_BACKEND=sqlite) pre-filled with synthetic users.
+#
+#   python bench_flow.py --users 1000 10000 100000 1000000 --operations 500
+#   python bench_flow.py --users 10000 --compare bench_results/<earlier run>.json
+#
+# For every table size it reports p50/p95/p99 latency, throughput and queries per
+# operation, and saves the results as JSON so runs can be compared between commits.
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ["DB_BACKEND"] = "sqlite"
+
+import numpy as np
+
+import card_catalog
+import db
+import passwords
+import repository
+import sqlite_backend
+
+OPERATIONS = ("create_user", "verify_credentials", "get_user_details", "create_credit_profile",
+              "check_eligibility", "update_user_credit_information")
+PASSWORD = "benchmark-password"
+
+
+def check_eligibility(user_id, credit_score, credit_limit, credit_history, income_requirement):
+    # Same lookup as main_app.check_eligibility, without the Streamlit result cache
+    return card_catalog.get_catalog().eligible_cards(credit_score, credit_limit, credit_history, income_requirement)
+
+
+def random_thresholds(rng):
+    return (rng.randint(300, 850), rng.randint(0, 20000), rng.randint(0, 120), rng.randint(0, 200000))
+
+
+# Function to fill profile and user_details with `users` synthetic rows
+def seed_users(conn, users, rounds, batch=50000):
+    rng = random.Random(users)
+    hashed = passwords._hash(PASSWORD, rounds)
+    cursor = conn.raw.cursor()
+    cursor.execute("BEGIN")
+    for start in range(1, users + 1, batch):
+        ids = range(start, min(start + batch, users + 1))
+        cursor.executemany(
+            "INSERT INTO profile (id, first_name, last_name, email_id, password, phone_number, address) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ((i, "First", "Last", "user{}@example.com".format(i), hashed, 5550000000 + i, "Address") for i in ids))
+        # Half of the users have already entered their credit details
+        cursor.executemany(
+            "INSERT INTO user_details VALUES (?, ?, ?, ?, ?)",
+            ((i,) + random_thresholds(rng) for i in ids if i % 2 == 0))
+    cursor.execute("COMMIT")
+
+
+def percentile_ms(samples, q):
+    return float(np.percentile(samples, q) * 1000)
+
+
+# Function to run `count` calls of each operation and collect latencies and query counts
+def run_operations(users, count, seed=0):
+    rng = random.Random(seed)
+    conn = sqlite_backend.get_connection()
+    queries = [0]
+    conn.raw.set_trace_callback(lambda statement: queries.__setitem__(0, queries[0] + 1))
+
+    new_ids = iter(range(users + 1, users + count + 1))
+    existing = lambda: rng.randint(1, users)
+    without_details = lambda: rng.randrange(1, users + 1, 2)  # odd ids have no user_details yet
+    calls = {
+        "create_user": lambda: repository.create_user(
+            "First", "Last", "new{}@example.com".format(next(new_ids)), PASSWORD, "Address", 5551234567),
+        "verify_credentials": lambda: repository.verify_credentials(
+            "user{}@example.com".format(existing()), PASSWORD),
+        "get_user_details": lambda: repository.get_user_details("user{}@example.com".format(existing())),
+        "create_credit_profile": lambda: repository.create_credit_profile(
+            without_details(), *random_thresholds(rng)),
+        "check_eligibility": lambda: check_eligibility(existing(), *random_thresholds(rng)),
+        "update_user_credit_information": lambda: repository.update_user_credit_information(
+            existing(), *random_thresholds(rng)),
+    }
+
+    results = {}
+    for name in OPERATIONS:
+        call = calls[name]
+        samples = []
+        queries[0] = 0
+        started = time.perf_counter()
+        for _ in range(count):
+            t0 = time.perf_counter()
+            call()
+            samples.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - started
+        results[name] = {
+            "count": count,
+            "p50_ms": percentile_ms(samples, 50),
+            "p95_ms": percentile_ms(samples, 95),
+            "p99_ms": percentile_ms(samples, 99),
+            "throughput_per_s": count / elapsed,
+            "queries_per_op": queries[0] / count,
+        }
+    conn.raw.set_trace_callback(None)
+    return results
+
+
+def git_commit():
+    # Ask the repository this file lives in, not whatever directory the benchmark runs from
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(users, results, baseline=None):
+    print("\n{} users".format(users))
+    print("{:<32} {:>9} {:>9} {:>9} {:>11} {:>9}{}".format(
+        "operation", "p50 ms", "p95 ms", "p99 ms", "ops/sec", "queries", "  p50 vs baseline" if baseline else ""))
+    for name, stats in results.items():
+        line = "{:<32} {:>9.3f} {:>9.3f} {:>9.3f} {:>11.1f} {:>9.2f}".format(
+            name, stats["p50_ms"], stats["p95_ms"], stats["p99_ms"], stats["throughput_per_s"], stats["queries_per_op"])
+        if baseline and name in baseline:
+            line += "  {:>+15.1%}".format(stats["p50_ms"] / baseline[name]["p50_ms"] - 1)
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the signup -> login -> eligibility flow")
+    parser.add_argument("--users", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--operations", type=int, default=500, help="calls per operation")
+    parser.add_argument("--rounds", type=int, default=passwords.PBKDF2_ROUNDS, help="pbkdf2 rounds")
+    parser.add_argument("--output", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_results"))
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    passwords.HASH_POOL_SIZE = 0
+    passwords.PBKDF2_ROUNDS = args.rounds
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = {run["users"]: run["operations"] for run in json.load(f)["runs"]}
+
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for users in args.users:
+            sqlite_backend.SQLITE_PATH = os.path.join(tmp, "bench-{}.sqlite3".format(users))
+            conn = sqlite_backend.get_connection()
+            sqlite_backend.bootstrap(conn)
+            seed_users(conn, users, args.rounds)
+            card_catalog.refresh_catalog()
+            results = run_operations(users, args.operations)
+            print_results(users, results, baseline.get(users) if baseline else None)
+            runs.append({"users": users, "operations": results})
+            conn.close()
+
+    os.makedirs(args.output, exist_ok=True)
+    commit = git_commit()
+    path = os.path.join(args.output, "bench-{}-{}.json".format(time.strftime("%Y%m%d-%H%M%S"), commit or "nogit"))
+    with open(path, "w") as f:
+        json.dump({"commit": commit, "backend": db.DB_BACKEND, "python": sys.version.split()[0],
+                   "pbkdf2_rounds": args.rounds, "runs": runs}, f, indent=2)
+    print("\nSaved results to {}".format(path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# bench_import.py
+#
+# Cold-start check: imports each entry point in a fresh interpreter with -X importtime
+# and fails if it takes longer than its budget or loads a module it should only load lazily.
+#
+#   python bench_import.py                       check every entry point
+#   python bench_import.py main_app --repeat 9   one module, median of 9 runs
+#   IMPORT_BUDGET_MAIN_APP_MS=1200 python bench_import.py main_app
+#
+# Exits with status 1 when a check fails, so it can run in CI.
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Entry point -> (default budget in ms, modules that must not be imported by it).
+# Streamlit itself imports pandas and pyarrow, so main_app's budget is mostly Streamlit's;
+# the lazy-module lists catch app code pulling in the model, dataset or batch code eagerly.
+TARGETS = {
+    "main_app": (1500, ("approval_model", "dataset_cache", "batch_eligibility", "preprocessing")),
+    "api_server": (600, ("pandas", "pyarrow", "dataset_cache", "preprocessing")),
+    "repository": (250, ("pandas", "pyarrow", "streamlit")),
+}
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)$")
+
+
+def budget_ms(module):
+    return float(os.environ.get("IMPORT_BUDGET_{}_MS".format(module.upper()), TARGETS[module][0]))
+
+
+# Function to import `module` in a new interpreter.
+# Returns (cumulative ms, every module it imported, {direct import: cumulative ms}).
+def measure(module):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import " + module],
+                            cwd=APP_DIR, capture_output=True, text=True, check=True)
+    # Nested imports are reported before their parent, indented two more spaces per level
+    pending = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match is None:
+            continue
+        depth, name, cumulative = len(match.group(3)), match.group(4), int(match.group(2)) / 1000
+        if depth > 1:
+            pending.append((depth, name, cumulative))
+        elif name == module:
+            children = {child: ms for child_depth, child, ms in pending if child_depth == 3}
+            return cumulative, {child for _, child, _ in pending}, children
+        else:
+            pending = []
+    raise RuntimeError("no import time reported for " + module)
+
+
+# Function to check one entry point; returns a list of failure messages
+def check(module, repeat):
+    runs = [measure(module) for _ in range(repeat)]
+    total = statistics.median(run[0] for run in runs)
+    imported, children = runs[-1][1], runs[-1][2]
+    budget = budget_ms(module)
+    print("{:<12} {:>8.1f} ms  (budget {:.0f} ms, median of {})".format(module, total, budget, repeat))
+    slowest = sorted(((ms, name) for name, ms in children.items()), reverse=True)[:5]
+    print("             slowest: {}".format(", ".join("{} {:.0f} ms".format(name, ms) for ms, name in slowest)))
+    failures = []
+    if total > budget:
+        failures.append("{} took {:.1f} ms, over its {:.0f} ms budget".format(module, total, budget))
+    for lazy in TARGETS[module][1]:
+        if lazy in imported:
+            failures.append("{} imports {} eagerly".format(module, lazy))
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check import time of the app's entry points")
+    parser.add_argument("modules", nargs="*", help="entry points to check: {} (default: all)".format(
+        ", ".join(TARGETS)))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    unknown = [module for module in args.modules if module not in TARGETS]
+    if unknown:
+        parser.error("unknown entry point: {}".format(", ".join(unknown)))
+
+    failures = []
+    for module in args.modules or TARGETS:
+        failures.extend(check(module, args.repeat))
+    for failure in failures:
+        print("FAIL: " + failure)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# bench_passwords.py
+#
+# Logins per second (password verifications) at various hashing pool sizes.
+#
+#   python bench_passwords.py --logins 200 --pool-sizes 0 1 2 4 --rounds 29000
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import passwords
+
+
+def run(pool_size, logins, rounds, clients):
+    passwords.shutdown()
+    passwords.HASH_POOL_SIZE = pool_size
+    stored_hash = passwords._hash("benchmark-password", rounds)
+    # Start the worker processes before timing
+    passwords.verify_and_update("benchmark-password", stored_hash, rounds)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as client_threads:
+        results = list(client_threads.map(
+            lambda _: passwords.verify_and_update("benchmark-password", stored_hash, rounds),
+            range(logins)))
+    elapsed = time.perf_counter() - start
+    passwords.shutdown()
+
+    assert all(verified for verified, _ in results)
+    return logins / elapsed
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Password verification throughput")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=passwords.PBKDF2_ROUNDS)
+    parser.add_argument("--clients", type=int, default=2 * cpus,
+                        help="concurrent login requests")
+    parser.add_argument("--pool-sizes", type=int, nargs="+",
+                        default=sorted({0, 1, max(1, cpus // 2), cpus}))
+    args = parser.parse_args()
+
+    print("rounds={} logins={} clients={}".format(args.rounds, args.logins, args.clients))
+    print("{:>10} {:>12}".format("pool_size", "logins/sec"))
+    for pool_size in args.pool_sizes:
+        rate = run(pool_size, args.logins, args.rounds, args.clients)
+        print("{:>10} {:>12.1f}".format(pool_size, rate))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# caching.py
+#
+# Streamlit caches for the app. The connection pool is held once per server process with
+# st.cache_resource (the card catalog is kept by card_catalog.get_catalog(), shared between
+# workers under deploy.py); eligibility results are cached per catalog version and threshold tuple with st.cache_data, bounded
+# by a TTL and an LRU size limit. Keying on the catalog version means a worker stops
+# serving results as soon as it picks up a catalog another worker published.
+#
+# Catalog edits are picked up by opening the app with ?invalidate_cache=<CACHE_ADMIN_TOKEN>,
+# or by calling invalidate_caches() from code.
+
+import os
+
+import streamlit as st
+
+import card_catalog
+import db
+
+ELIGIBILITY_CACHE_TTL = int(os.environ.get("ELIGIBILITY_CACHE_TTL", 600))
+ELIGIBILITY_CACHE_MAX_ENTRIES = int(os.environ.get("ELIGIBILITY_CACHE_MAX_ENTRIES", 10000))
+CACHE_ADMIN_TOKEN = os.environ.get("CACHE_ADMIN_TOKEN")
+
+
+@st.cache_resource
+def connection_pool():
+    # The SQLite backend keeps one connection per thread and has no pool to open
+    if db.DB_BACKEND == "sqlite":
+        return None
+    return db.get_pool()
+
+
+# Not st.cache_resource: card_catalog already keeps one catalog per process, and in a
+# multi-worker deployment it swaps in catalogs refreshed by other workers
+def catalog():
+    return card_catalog.get_catalog()
+
+
+@st.cache_data(ttl=ELIGIBILITY_CACHE_TTL, max_entries=ELIGIBILITY_CACHE_MAX_ENTRIES, show_spinner=False)
+def _eligible_cards(catalog_version, credit_score, credit_limit, credit_history, income_requirement):
+    return catalog().eligible_cards(credit_score, credit_limit, credit_history, income_requirement)
+
+
+@st.cache_data(ttl=ELIGIBILITY_CACHE_TTL, max_entries=ELIGIBILITY_CACHE_MAX_ENTRIES, show_spinner=False)
+def _ranked_eligibility(catalog_version, credit_score, credit_limit, credit_history, income_requirement):
+    return catalog().ranked_eligibility(credit_score, credit_limit, credit_history, income_requirement)
+
+
+def eligible_cards(credit_score, credit_limit, credit_history, income_requirement):
+    return _eligible_cards(card_catalog.catalog_version(),
+                           credit_score, credit_limit, credit_history, income_requirement)
+
+
+def ranked_eligibility(credit_score, credit_limit, credit_history, income_requirement):
+    return _ranked_eligibility(card_catalog.catalog_version(),
+                               credit_score, credit_limit, credit_history, income_requirement)
+
+
+# Function to drop the cached catalog and eligibility results so they are reloaded
+def invalidate_caches():
+    card_catalog.invalidate_catalog()
+    _eligible_cards.clear()
+    _ranked_eligibility.clear()
+
+
+# Function to run invalidate_caches() when an admin opens the app with the invalidation token
+def handle_admin_invalidation():
+    if not CACHE_ADMIN_TOKEN:
+        return
+    params = st.experimental_get_query_params()
+    if params.get("invalidate_cache", [None])[0] == CACHE_ADMIN_TOKEN:
+        invalidate_caches()
+        st.experimental_set_query_params()
+        st.sidebar.success("Caches invalidated. The card catalog will be reloaded.")
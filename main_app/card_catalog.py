@@ -0,0 +1,306 @@
+# card_catalog.py
+
+import math
+import os
+import threading
+import time
+
+import numpy as np
+
+import eligibility_rules
+import shared_cache
+from db import get_connection
+
+# Threshold columns of credit_card_details, in the order check_eligibility() compares them
+THRESHOLD_COLUMNS = (
+    "minimum_credit_score",
+    "minimum_past_credit_limit",
+    "minimum_credit_history",
+    "minimum_income_requriement",
+)
+
+# Cards missing by at most this much in total, measured in units of each column's spread
+# across the catalog, are reported as near misses
+NEAR_MISS_TOLERANCE = float(os.environ.get("NEAR_MISS_TOLERANCE", 0.1))
+
+# Arrays a catalog is rebuilt from when it is shared between worker processes
+SHARED_ARRAYS = ("thresholds", "scale", "tier", "lower", "upper", "clause_card", "clause_start",
+                 "lower_order", "sorted_lower", "upper_order", "sorted_upper")
+
+
+# Function to check that every value can be compared with the bounds: None, NaN and +-inf
+# never qualify (a NULL minimum is stored as inf, and inf must not meet it)
+def _usable(values):
+    return all(value is not None and math.isfinite(value) for value in values)
+
+
+# In-memory copy of the credit_card_details table with every card's eligibility rule
+# compiled into clauses of [lower, upper] intervals (see eligibility_rules.py); a card is
+# eligible when any of its clauses is met. Every bound column is also kept sorted, so the
+# clauses a value meets on one column are a prefix of that column's lower bound order and
+# can be found with a binary search.
+class CardCatalog:
+    def __init__(self, names, thresholds, rules=None):
+        self.names = list(names)
+        self.thresholds = np.asarray(thresholds, dtype=float).reshape(
+            len(self.names), len(THRESHOLD_COLUMNS))
+        # A NULL minimum never satisfies ">=" in SQL, so it must never match here either
+        self.thresholds[np.isnan(self.thresholds)] = np.inf
+        for name, array in eligibility_rules.compile_rules(self.names, self.thresholds, rules).items():
+            setattr(self, name, array)
+        self.lower_order = np.argsort(self.lower, axis=0, kind="stable")
+        self.sorted_lower = np.take_along_axis(self.lower, self.lower_order, axis=0)
+        self.upper_order = np.argsort(self.upper, axis=0, kind="stable")
+        self.sorted_upper = np.take_along_axis(self.upper, self.upper_order, axis=0)
+        # Per-column spread, so margins in dollars, months and score points can be compared
+        finite = np.where(np.isfinite(self.thresholds), self.thresholds, np.nan)
+        with np.errstate(invalid="ignore"):
+            spread = np.nanmax(finite, axis=0) - np.nanmin(finite, axis=0) if len(self.names) else np.ones(4)
+        self.scale = np.where(np.isnan(spread) | (spread <= 0), 1.0, spread)
+        # Ranking score: how demanding each card is, 0 (entry level) to 1 (most selective)
+        self.tier = np.nan_to_num(finite / self.scale, nan=0.0).mean(axis=1) if len(self.names) else np.zeros(0)
+        if len(self.names) and np.ptp(self.tier) > 0:
+            self.tier = (self.tier - self.tier.min()) / np.ptp(self.tier)
+
+    # Catalog over precomputed (possibly memory-mapped, read-only) arrays, see shared_cache.py
+    @classmethod
+    def from_arrays(cls, names, arrays):
+        catalog = cls.__new__(cls)
+        catalog.names = list(names)
+        for name in SHARED_ARRAYS:
+            setattr(catalog, name, arrays[name])
+        return catalog
+
+    def __len__(self):
+        return len(self.names)
+
+    # Function to reduce a per-clause boolean array (last axis) to a per-card one
+    def _any_clause(self, met):
+        if len(self.clause_card) == len(self.names):
+            # One clause per card (no OR rules): clauses are the cards
+            return met
+        return np.logical_or.reduceat(met, self.clause_start, axis=-1)
+
+    # Indices of every clause of the given cards
+    def _card_clauses(self, cards):
+        starts = self.clause_start[cards]
+        counts = np.append(self.clause_start[1:], len(self.clause_card))[cards] - starts
+        return np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+
+    # Boolean mask over the catalog of the cards the given values qualify for
+    def eligible_mask(self, credit_score, credit_limit, credit_history, income_requirement):
+        values = (credit_score, credit_limit, credit_history, income_requirement)
+        hits = np.zeros(len(self.clause_card), dtype=np.int8)
+        if not _usable(values):
+            return np.zeros(len(self.names), dtype=bool)
+        over = np.zeros(len(self.clause_card), dtype=bool)
+        for column, value in enumerate(values):
+            cleared = np.searchsorted(self.sorted_lower[:, column], value, side="right")
+            hits[self.lower_order[:cleared, column]] += 1
+            # Upper bounds are mostly unset (inf), so mark the few clauses the value exceeds
+            if len(over) and self.sorted_upper[0, column] < value:
+                exceeded = np.searchsorted(self.sorted_upper[:, column], value, side="left")
+                over[self.upper_order[:exceeded, column]] = True
+        return self._any_clause((hits == len(values)) & ~over)
+
+    # Boolean array over the clauses whose bounds the values are within `slack` (per column)
+    # of on every column; two binary searches per column, like eligible_mask()
+    def _clauses_near(self, values, slack):
+        hits = np.zeros(len(self.clause_card), dtype=np.int8)
+        for column, value in enumerate(values):
+            cleared = np.searchsorted(self.sorted_lower[:, column], value + slack[column], side="right")
+            hits[self.lower_order[:cleared, column]] += 1
+            under = np.searchsorted(self.sorted_upper[:, column], value - slack[column], side="left")
+            hits[self.upper_order[under:, column]] += 1
+        return hits == 2 * len(values)
+
+    # Mask for `values` worked out from the mask for `previous_values`. A clause can only change
+    # state if one of its bounds lies between a field's old and new value, and the sorted bound
+    # columns give those clauses directly; the cards they belong to are re-checked against all
+    # their clauses. Returns (mask, number of cards re-checked).
+    def update_mask(self, previous_mask, previous_values, values):
+        if not (_usable(previous_values) and _usable(values)):
+            return self.eligible_mask(*values), len(self.names)
+        candidates = []
+        for column, (old, new) in enumerate(zip(previous_values, values)):
+            if old == new:
+                continue
+            low, high = sorted((old, new))
+            # value >= lower flips when old < lower <= new, value <= upper when old <= upper < new
+            start, stop = np.searchsorted(self.sorted_lower[:, column], (low, high), side="right")
+            candidates.append(self.lower_order[start:stop, column])
+            start, stop = np.searchsorted(self.sorted_upper[:, column], (low, high), side="left")
+            candidates.append(self.upper_order[start:stop, column])
+        mask = np.array(previous_mask, dtype=bool)
+        if not candidates:
+            return mask, 0
+        cards = np.unique(self.clause_card[np.concatenate(candidates)])
+        clauses = self._card_clauses(cards)
+        values = np.asarray(values, dtype=float)
+        met = ((self.lower[clauses] <= values) & (values <= self.upper[clauses])).all(axis=1)
+        mask[cards] = False
+        mask[self.clause_card[clauses[met]]] = True
+        return mask, len(cards)
+
+    # Applicants x cards eligibility for an (applicants, 4) array of values; an applicant with
+    # a NaN or infinite value never qualifies
+    def eligibility_matrix(self, values):
+        values = np.asarray(values, dtype=float).reshape(-1, len(THRESHOLD_COLUMNS))
+        finite = np.isfinite(values).all(axis=1)
+        values = values[:, np.newaxis, :]
+        # (applicants, 1, columns) against (1, clauses, columns) -> (applicants, clauses)
+        met = ((values >= self.lower[np.newaxis]) & (values <= self.upper[np.newaxis])).all(axis=2)
+        return self._any_clause(met) & finite[:, np.newaxis]
+
+    # Eligible cards in catalog order, shaped like the rows of the old SQL query: [(credit_card,), ...]
+    def eligible_cards(self, credit_score, credit_limit, credit_history, income_requirement):
+        mask = self.eligible_mask(credit_score, credit_limit, credit_history, income_requirement)
+        return [(self.names[i],) for i in np.flatnonzero(mask)]
+
+    # Eligible cards best offer first, then near misses closest first, each with the margin
+    # by which the values clear (positive) or miss (negative) the bounds of the card's closest
+    # clause (None for fields the clause does not constrain).
+    # Without `mask` this is one vectorized pass over the whole catalog. With the eligible_mask()
+    # or update_mask() result for the same values, eligibility is taken from the mask and only
+    # the eligible cards and the cards with a clause within the tolerance of every value are
+    # scored. Returns a list of dicts.
+    def ranked_eligibility(self, credit_score, credit_limit, credit_history, income_requirement,
+                           near_miss_tolerance=NEAR_MISS_TOLERANCE, mask=None):
+        values = (credit_score, credit_limit, credit_history, income_requirement)
+        if not _usable(values) or not len(self.names):
+            return []
+        values = np.asarray(values, dtype=float)
+        if mask is None:
+            cards, clauses = np.arange(len(self.names)), slice(None)
+        else:
+            # A near miss falls short by at most the tolerance on each column; the slack is
+            # widened a little so rounding never drops one, the shortfall test below is exact
+            slack = near_miss_tolerance * self.scale * (1 + 1e-9)
+            mask = np.asarray(mask, dtype=bool)
+            cards = np.flatnonzero(mask | self._any_clause(self._clauses_near(values, slack)))
+            clauses = self._card_clauses(cards)
+        lower, upper, clause_card = self.lower[clauses], self.upper[clauses], self.clause_card[clauses]
+        # Eligibility uses the same clause test as eligible_mask(); shortfalls are only for
+        # ordering, as margins a float step from a bound can round to a shortfall of 0
+        clause_met = ((lower <= values) & (values <= upper)).all(axis=1)
+        clause_margins = np.minimum(values - lower, upper - values)
+        clause_shortfall = (np.maximum(-clause_margins, 0) / self.scale).sum(axis=1)
+        eligible = self._any_clause(clause_met) if mask is None else mask[cards]
+        if len(clause_card) == len(cards):
+            margins, shortfall = clause_margins, clause_shortfall
+        else:
+            # Clauses sorted by card, met ones first, then by shortfall: each card's first
+            # clause is the one it is reported against
+            order = np.lexsort((clause_shortfall, ~clause_met, clause_card))
+            closest = order[np.searchsorted(clause_card, cards)]
+            margins = clause_margins[closest]
+            shortfall = clause_shortfall[closest]
+        tier = self.tier[cards]
+        near_miss = ~eligible & (shortfall <= near_miss_tolerance)
+        # Eligible cards sort by tier (most selective first), near misses by how close they are, then by tier
+        key = np.where(eligible, -tier, 1 + shortfall)
+        selected = np.flatnonzero(eligible | near_miss)
+        results = []
+        for i in selected[np.lexsort((-tier[selected], key[selected]))]:
+            results.append({
+                "credit_card": self.names[cards[i]],
+                "eligible": bool(eligible[i]),
+                "score": round(float(tier[i]), 4),
+                "shortfall": round(float(shortfall[i]), 4),
+                "margins": {column: margin if math.isfinite(margin) else None
+                            for column, margin in zip(THRESHOLD_COLUMNS, margins[i].tolist())},
+            })
+        return results
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+_catalog_generation = None
+_next_check = 0
+# Bumped every time a different catalog is swapped in, see catalog_version()
+_catalog_version = 0
+
+
+# Function to read the whole credit_card_details table and the card rules into a CardCatalog
+def load_catalog():
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT credit_card, {} FROM credit_card_details".format(
+            ", ".join(THRESHOLD_COLUMNS)))
+        rows = cursor.fetchall()
+    names = [row[0] for row in rows]
+    thresholds = [[np.nan if value is None else value for value in row[1:]] for row in rows]
+    return CardCatalog(names, thresholds, eligibility_rules.load_rules())
+
+
+# Function to publish a catalog for the other worker processes
+def publish_catalog(catalog):
+    return shared_cache.publish("catalog", {name: getattr(catalog, name) for name in SHARED_ARRAYS},
+                                {"names": catalog.names})
+
+
+# Function to get the catalog published by any worker, loading and publishing it if there is none.
+# The published generation is re-checked at most every shared_cache.CHECK_INTERVAL seconds.
+def _get_shared_catalog():
+    global _catalog, _catalog_generation, _next_check, _catalog_version
+    if _catalog is not None and time.monotonic() < _next_check:
+        return _catalog
+    with _catalog_lock:
+        generation = shared_cache.current("catalog")
+        if generation is None:
+            catalog = load_catalog()
+            generation = publish_catalog(catalog)
+            _catalog = catalog
+            _catalog_version += 1
+        elif generation != _catalog_generation or _catalog is None:
+            arrays, metadata = shared_cache.load("catalog", generation)
+            _catalog = CardCatalog.from_arrays(metadata["names"], arrays)
+            _catalog_version += 1
+        _catalog_generation = generation
+        _next_check = time.monotonic() + shared_cache.CHECK_INTERVAL
+        return _catalog
+
+
+# Function to get the process-wide catalog, loading it on first use
+def get_catalog():
+    global _catalog, _catalog_version
+    if shared_cache.ENABLED:
+        return _get_shared_catalog()
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = load_catalog()
+                _catalog_version += 1
+    return _catalog
+
+
+# Function to get a number identifying the catalog get_catalog() currently returns; it changes
+# whenever the catalog is reloaded, refreshed or swapped for one published by another worker,
+# so results cached per catalog_version() are never served for an older catalog
+def catalog_version():
+    get_catalog()
+    return _catalog_version
+
+
+# Function to reload the catalog after credit_card_details has changed
+# (and hand it to the other workers when the catalog is shared)
+def refresh_catalog():
+    global _catalog, _catalog_generation, _next_check, _catalog_version
+    catalog = load_catalog()
+    with _catalog_lock:
+        if shared_cache.ENABLED:
+            _catalog_generation = publish_catalog(catalog)
+            _next_check = time.monotonic() + shared_cache.CHECK_INTERVAL
+        _catalog = catalog
+        _catalog_version += 1
+    return catalog
+
+
+# Function to drop the cached catalog; the next get_catalog() call reloads it.
+# A shared catalog is withdrawn, so whichever worker needs it next reloads and republishes it.
+def invalidate_catalog():
+    global _catalog
+    with _catalog_lock:
+        if shared_cache.ENABLED:
+            shared_cache.retire("catalog")
+        _catalog = None
@@ -0,0 +1,261 @@
+# catalog_import.py
+#
+# Bulk import of the card catalog from the issuers' spreadsheet or a CSV export,
+# replacing the one-INSERT-per-card credit_card_details.sql script.
+#
+#   python catalog_import.py "credit card details.xlsx"
+#   python catalog_import.py cards.csv --dry-run     validate only, print rejected rows
+#   python catalog_import.py cards.csv --strict      refuse to load if any row is rejected
+#
+# Rows are normalised ("$45,000+" -> 45000, "No Min" -> 0, "6 months" -> 6, names trimmed)
+# and validated, then loaded into a staging table with COPY and swapped in for
+# credit_card_details in a single transaction, so readers see either the old catalog
+# or the new one. Credit history is stored in months, the unit the app asks users for.
+
+import argparse
+import csv
+import io
+import os
+import re
+import sys
+import time
+
+import card_catalog
+import db
+from card_catalog import THRESHOLD_COLUMNS
+from db import get_connection
+from migrations import CATALOG_INDEXES
+
+CATALOG_COLUMNS = ("credit_card",) + THRESHOLD_COLUMNS
+
+# Accepted spellings of each column header, after lower-casing and collapsing spaces/underscores
+HEADER_ALIASES = {
+    "credit_card": ("credit card", "card", "card name", "name"),
+    "minimum_credit_score": ("minimum credit score", "min credit score", "credit score"),
+    "minimum_past_credit_limit": ("minimum past credit limit", "minimum credit limit", "min credit limit",
+                                  "past credit limit", "credit limit"),
+    "minimum_credit_history": ("minimum credit history", "min credit history", "credit history"),
+    "minimum_income_requriement": ("minimum income requriement", "minimum income requirement",
+                                   "min income requirement", "income requirement", "income"),
+}
+
+MAX_NAME_LENGTH = 100
+CREDIT_SCORE_RANGE = (0, 850)
+NO_MINIMUM = re.compile(r"^no\s*min(imum)?\.?$")
+HISTORY = re.compile(r"^(\d+(?:\.\d+)?)\s*(month|months|mo|year|years|yr|yrs)?$")
+
+# Give up on the swap rather than wait longer than this for the table lock (readers queue behind it)
+SWAP_LOCK_TIMEOUT = os.environ.get("CATALOG_SWAP_LOCK_TIMEOUT", "5s")
+
+
+class RowError(ValueError):
+    pass
+
+
+def _header_key(header):
+    return re.sub(r"[\s_]+", " ", str(header or "")).strip().lower()
+
+
+# Function to map the file's header row onto CATALOG_COLUMNS; returns {column: position}
+def map_headers(headers):
+    positions = {}
+    keys = [_header_key(header) for header in headers]
+    for column, aliases in HEADER_ALIASES.items():
+        for alias in (column.replace("_", " "),) + aliases:
+            if alias in keys:
+                positions[column] = keys.index(alias)
+                break
+    missing = [column for column in CATALOG_COLUMNS if column not in positions]
+    if missing:
+        raise ValueError("Missing columns: {} (found {})".format(", ".join(missing), ", ".join(map(str, headers))))
+    return positions
+
+
+def read_csv_rows(path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        yield from csv.reader(f)
+
+
+def read_xlsx_rows(path, sheet=None):
+    try:
+        import openpyxl
+    except ImportError:
+        raise SystemExit("Reading .xlsx files needs openpyxl (pip install openpyxl), or export the sheet to CSV")
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.active
+        yield from worksheet.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+# Function to yield (line number, {column: raw value}) for every data row of a spreadsheet or CSV file
+def read_rows(path, sheet=None):
+    if os.path.splitext(path)[1].lower() in (".xlsx", ".xlsm"):
+        rows = read_xlsx_rows(path, sheet)
+    else:
+        rows = read_csv_rows(path)
+    positions = None
+    for line, row in enumerate(rows, start=1):
+        if positions is None:
+            positions = map_headers(row)
+            continue
+        if not any(value not in (None, "") for value in row):
+            continue
+        yield line, {column: row[position] if position < len(row) else None
+                     for column, position in positions.items()}
+
+
+def parse_amount(value, field):
+    if isinstance(value, (int, float)):
+        amount = float(value)
+    else:
+        text = str(value or "").strip().lower()
+        if not text:
+            raise RowError("{} is empty".format(field))
+        if NO_MINIMUM.match(text):
+            return 0
+        try:
+            amount = float(text.replace("$", "").replace(",", "").rstrip("+").strip())
+        except ValueError:
+            raise RowError("{} is not a number: {!r}".format(field, value))
+    if amount != amount or amount < 0:
+        raise RowError("{} must be a non-negative number: {!r}".format(field, value))
+    return int(round(amount))
+
+
+# Function to turn "6 months" / "1 year" / "2 yrs" / a bare number of months into months
+def parse_history(value):
+    if isinstance(value, (int, float)):
+        months = float(value)
+    else:
+        text = str(value or "").strip().lower()
+        if NO_MINIMUM.match(text):
+            return 0
+        match = HISTORY.match(text)
+        if match is None:
+            raise RowError("minimum_credit_history is not a duration: {!r}".format(value))
+        months = float(match.group(1))
+        if (match.group(2) or "month").startswith("y"):
+            months *= 12
+    if months != months or months < 0:
+        raise RowError("minimum_credit_history must be non-negative: {!r}".format(value))
+    return int(round(months))
+
+
+# Function to clean one raw row into a catalog record, raising RowError if it is unusable
+def normalise_row(raw):
+    name = re.sub(r"\s+", " ", str(raw["credit_card"] or "")).strip()
+    if not name:
+        raise RowError("credit_card is empty")
+    if len(name) > MAX_NAME_LENGTH:
+        raise RowError("credit_card is longer than {} characters".format(MAX_NAME_LENGTH))
+    credit_score = parse_amount(raw["minimum_credit_score"], "minimum_credit_score")
+    if not CREDIT_SCORE_RANGE[0] <= credit_score <= CREDIT_SCORE_RANGE[1]:
+        raise RowError("minimum_credit_score {} is outside {}-{}".format(credit_score, *CREDIT_SCORE_RANGE))
+    return (name,
+            credit_score,
+            parse_amount(raw["minimum_past_credit_limit"], "minimum_past_credit_limit"),
+            parse_history(raw["minimum_credit_history"]),
+            parse_amount(raw["minimum_income_requriement"], "minimum_income_requriement"))
+
+
+# Function to normalise every row; returns (records, rejects) with rejects as (line, reason)
+def validate(rows):
+    records, rejects, seen = [], [], {}
+    for line, raw in rows:
+        try:
+            record = normalise_row(raw)
+        except RowError as e:
+            rejects.append((line, str(e)))
+            continue
+        key = record[0].lower()
+        if key in seen:
+            rejects.append((line, "duplicate of line {}: {}".format(seen[key], record[0])))
+            continue
+        seen[key] = line
+        records.append(record)
+    return records, rejects
+
+
+# Function to replace credit_card_details with `records` in one transaction (Postgres)
+def swap_postgres(records):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(records)
+    buffer.seek(0)
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        conn.autocommit = False
+        try:
+            cursor.execute("DROP TABLE IF EXISTS credit_card_details_staging")
+            cursor.execute("""
+                CREATE TABLE credit_card_details_staging
+                (LIKE credit_card_details INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+            """)
+            cursor.copy_expert("COPY credit_card_details_staging ({}) FROM STDIN WITH (FORMAT csv)".format(
+                ", ".join(CATALOG_COLUMNS)), buffer)
+            cursor.execute("SET LOCAL lock_timeout = %s", (SWAP_LOCK_TIMEOUT,))
+            cursor.execute("ALTER TABLE credit_card_details RENAME TO credit_card_details_previous")
+            cursor.execute("ALTER TABLE credit_card_details_staging RENAME TO credit_card_details")
+            cursor.execute("DROP TABLE credit_card_details_previous")
+            # The old indexes went with the old table
+            cursor.execute(CATALOG_INDEXES)
+            cursor.execute("ANALYZE credit_card_details")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.autocommit = True
+
+
+# Function to replace the catalog rows in one transaction (SQLite; WAL readers keep their snapshot)
+def swap_sqlite(records):
+    with get_connection() as conn:
+        raw = conn.raw
+        raw.execute("BEGIN IMMEDIATE")
+        try:
+            raw.execute("DELETE FROM credit_card_details")
+            raw.executemany("INSERT INTO credit_card_details ({}) VALUES (?, ?, ?, ?, ?)".format(
+                ", ".join(CATALOG_COLUMNS)), records)
+            raw.execute("COMMIT")
+        except Exception:
+            raw.execute("ROLLBACK")
+            raise
+
+
+# Function to load validated records into credit_card_details and reload this process's catalog
+def load(records):
+    if db.DB_BACKEND == "sqlite":
+        swap_sqlite(records)
+    else:
+        swap_postgres(records)
+    return card_catalog.refresh_catalog()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import the credit card catalog from a spreadsheet or CSV file")
+    parser.add_argument("path")
+    parser.add_argument("--sheet", help="worksheet name (default: the active sheet)")
+    parser.add_argument("--dry-run", action="store_true", help="validate without loading")
+    parser.add_argument("--strict", action="store_true", help="do not load anything if a row is rejected")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    records, rejects = validate(read_rows(args.path, args.sheet))
+    for line, reason in rejects:
+        print("Rejected line {}: {}".format(line, reason), file=sys.stderr)
+    print("{} valid cards, {} rejected rows".format(len(records), len(rejects)))
+    if args.dry_run:
+        return
+    if not records or (rejects and args.strict):
+        sys.exit("Nothing loaded")
+
+    catalog = load(records)
+    print("Loaded {} cards in {:.2f}s".format(len(catalog), time.perf_counter() - started))
+    print("Other running processes pick up the new catalog after POST /admin/invalidate "
+          "or ?invalidate_cache=<token> on the Streamlit app")
+
+
+if __name__ == "__main__":
+    main()
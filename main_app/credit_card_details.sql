@@ -1,70 +1,70 @@
 
-insert into credit_card_details (credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement)	values('American Express Green Card',700,	5000	,1		,45000		   );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('American Express Gold Card',670,	5000	,1		,45000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('American Express Platinum Card                              ',720,	10000	,1		,60000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('American Express Blue Cash Preferred Card                   ',690,	3000	,1		,10000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('American Express Blue Cash Everyday Card                    ',620,	2000	,0.5	,30000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('American Express EveryDay Credit Card                       ',670,	3000	,1		,25000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('American Express Delta SkyMiles Credit Cards                ',690,	5000	,1		,25000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase Sapphire Preferred                                    ',690,	5000	,1		,15000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase Sapphire Reserve                                      ',720,	10000	,2		,40000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase Freedom Flex                                          ',690,	3000	,1		,10000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase Freedom Unlimited                                     ',690,	3000	,1		,30000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase Ink Business Preferred                                ',690,	5000	,1		,30000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase Ink Business Cash                                     ',690,	3000	,1		,15000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase Ink Business Unlimited                                ',690,	3000	,1		,15000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase Southwest Rapid Rewards Plus                          ',690,	3000	,1		,15000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase Southwest Rapid Rewards Premier                       ',690,	3000	,1		,30000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase Southwest Rapid Rewards Priority                      ',690,	3000	,1		,30000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase United Explorer                                       ',690,	5000	,1		,30000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase United Quest                                          ',690,	5000	,1		,30000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase Iberia Visa Signature                                 ',690,	5000	,1		,30000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase Aer Lingus Visa Signature                             ',690,	5000	,1		,30000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase British Airways Visa Signature                        ',690,	5000	,1		,30000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase Hyatt Credit Card                                     ',690,	5000	,1		,30000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase Marriott Bonvoy Boundless                             ',690,	5000	,1		,30000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Wells Fargo Propel American Express                         ',690,	3000	,1		,30000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Wells Fargo Cash Wise Visa                                  ',690,	3000	,1		,25000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Wells Fargo Active Cash Card                                ',690,	3000	,1		,25000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Wells Fargo Autograph Card                                  ',690,	5000	,1		,25000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Wells Fargo Platinum Card                                   ',690,	3000	,1		,25000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Wells Fargo Reflect Card                                    ',620,	1000	,0.5	,20000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Wells Fargo Rewards Card                                    ',620,	1000	,0.5	,25000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Wells Fargo Cash Back College Card                          ',620,	500	    ,0.5	 ,1250          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Capital One Venture Rewards                                 ',690,	3000	,1		,0000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Capital One VentureOne Rewards                              ',670,	3000	,1		,40000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Capital One VentureOne Rewards for Average Credit           ',620,	1000	,0.5	,20000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Capital One Quicksilver Cash Rewards                        ',670,	2000	,1		,20000          );
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Capital One QuicksilverOne Cash Rewards                     ',620,	1000	,0.5	,20000			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Capital One Savor Cash Rewards                              ',690,	3000	,1		,20000			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Capital One SavorOne Cash Rewards                           ',670,	3000	,1		,30000			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Capital One Premier Dining Rewards                          ',690,	5000	,1		,20000			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Capital One Rewards+ Visa Signature                         ',690,	3000	,1		,30000			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Capital One Spark Miles for Business                        ',690,	5000	,1		,10000			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Capital One Spark Cash for Business                         ',690,	5000	,1		,15000			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Capital One Spark Classic for Business                      ',690,	5000	,1		,15000			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Capital One Spark Miles Select for Business                 ',690,	5000	,1		,15000			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Capital One Secured Mastercard                             	',0,		0		,0.5	,15000			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Bank of America Premium Rewards card                        ',700,	5000	,2		,10000			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Bank of America Customized Cash Rewards credit card         ',670,	3000	,1		,30000			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Bank of America Travel Rewards credit card                  ',690,	3000	,1		,20000			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Bank of America Unlimited Cash Rewards credit card          ',670,	2000	,1		,20000			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Bank of America Rewards credit card                         ',670,	2000	,1		,20000			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Bank of America Cash Rewards credit card for Students       ',0	,	500		,0.5	,20000			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Bank of America Travel Rewards credit card for Students     ',0	,	500		,0.5	,10000			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Bank of America Cash Rewards Secured credit card            ',0	,	0		,0.5	,10000			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Bank of America Unlimited Cash Rewards Secured credit card  ',0	,	0		,0.5	,10000			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Bank of America Platinum Plus Secured credit card           ',0	,	0		,0.5	,10000			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Bank of America Rewards Secured credit card                 ',0	,	0		,0.5	,10000			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Citi Prestige® Card                                         ',720,	10000	,2		,10000			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Citi Premier® Card                                          ',690,	5000	,1		,60000			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Citi Rewards+® Card                                         ',670,	3000	,1		,40000			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Citi Double Cash Card                                       ',670,	2000	,1		,10000			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Citi Custom Cash® Card                                      ',670,	2000	,1		,10000			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Citi Diamond Preferred® Card                                ',670,	3000	,1		,10000			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Citi Simplicity® Card                                       ',670,	2000	,1		,20000			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Citi Rewards+® Student Card                                 ',670,	500	   ,0.5	,10000 			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Citi ThankYou® Preferred Card                               ',670,	1000	,0.5	,10000 			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Citi Secured Mastercard®                                   	',0,		0		,0.5	,20000	 			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Citi® Secured Mastercard® for Students						',0,		0		,0.5	,10000	 			);
-insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Citi Rewards+® Secured Card									',0,		0		,0.5	,10000	 			);
+insert into credit_card_details (credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement)	values('American Express Green Card',700,	5000	,12		,45000		   );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('American Express Gold Card',670,	5000	,12		,45000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('American Express Platinum Card                              ',720,	10000	,12		,60000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('American Express Blue Cash Preferred Card                   ',690,	3000	,12		,10000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('American Express Blue Cash Everyday Card                    ',620,	2000	,6	,30000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('American Express EveryDay Credit Card                       ',670,	3000	,12		,25000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('American Express Delta SkyMiles Credit Cards                ',690,	5000	,12		,25000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase Sapphire Preferred                                    ',690,	5000	,12		,15000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase Sapphire Reserve                                      ',720,	10000	,24		,40000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase Freedom Flex                                          ',690,	3000	,12		,10000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase Freedom Unlimited                                     ',690,	3000	,12		,30000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase Ink Business Preferred                                ',690,	5000	,12		,30000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase Ink Business Cash                                     ',690,	3000	,12		,15000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase Ink Business Unlimited                                ',690,	3000	,12		,15000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase Southwest Rapid Rewards Plus                          ',690,	3000	,12		,15000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase Southwest Rapid Rewards Premier                       ',690,	3000	,12		,30000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase Southwest Rapid Rewards Priority                      ',690,	3000	,12		,30000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase United Explorer                                       ',690,	5000	,12		,30000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase United Quest                                          ',690,	5000	,12		,30000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase Iberia Visa Signature                                 ',690,	5000	,12		,30000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase Aer Lingus Visa Signature                             ',690,	5000	,12		,30000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase British Airways Visa Signature                        ',690,	5000	,12		,30000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase Hyatt Credit Card                                     ',690,	5000	,12		,30000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Chase Marriott Bonvoy Boundless                             ',690,	5000	,12		,30000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Wells Fargo Propel American Express                         ',690,	3000	,12		,30000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Wells Fargo Cash Wise Visa                                  ',690,	3000	,12		,25000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Wells Fargo Active Cash Card                                ',690,	3000	,12		,25000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Wells Fargo Autograph Card                                  ',690,	5000	,12		,25000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Wells Fargo Platinum Card                                   ',690,	3000	,12		,25000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Wells Fargo Reflect Card                                    ',620,	1000	,6	,20000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Wells Fargo Rewards Card                                    ',620,	1000	,6	,25000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Wells Fargo Cash Back College Card                          ',620,	500	    ,6	 ,1250          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Capital One Venture Rewards                                 ',690,	3000	,12		,0000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Capital One VentureOne Rewards                              ',670,	3000	,12		,40000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Capital One VentureOne Rewards for Average Credit           ',620,	1000	,6	,20000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Capital One Quicksilver Cash Rewards                        ',670,	2000	,12		,20000          );
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Capital One QuicksilverOne Cash Rewards                     ',620,	1000	,6	,20000			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Capital One Savor Cash Rewards                              ',690,	3000	,12		,20000			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Capital One SavorOne Cash Rewards                           ',670,	3000	,12		,30000			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Capital One Premier Dining Rewards                          ',690,	5000	,12		,20000			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Capital One Rewards+ Visa Signature                         ',690,	3000	,12		,30000			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Capital One Spark Miles for Business                        ',690,	5000	,12		,10000			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Capital One Spark Cash for Business                         ',690,	5000	,12		,15000			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Capital One Spark Classic for Business                      ',690,	5000	,12		,15000			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Capital One Spark Miles Select for Business                 ',690,	5000	,12		,15000			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Capital One Secured Mastercard                             	',0,		0		,6	,15000			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Bank of America Premium Rewards card                        ',700,	5000	,24		,10000			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Bank of America Customized Cash Rewards credit card         ',670,	3000	,12		,30000			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Bank of America Travel Rewards credit card                  ',690,	3000	,12		,20000			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Bank of America Unlimited Cash Rewards credit card          ',670,	2000	,12		,20000			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Bank of America Rewards credit card                         ',670,	2000	,12		,20000			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Bank of America Cash Rewards credit card for Students       ',0	,	500		,6	,20000			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Bank of America Travel Rewards credit card for Students     ',0	,	500		,6	,10000			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Bank of America Cash Rewards Secured credit card            ',0	,	0		,6	,10000			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Bank of America Unlimited Cash Rewards Secured credit card  ',0	,	0		,6	,10000			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Bank of America Platinum Plus Secured credit card           ',0	,	0		,6	,10000			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Bank of America Rewards Secured credit card                 ',0	,	0		,6	,10000			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Citi Prestige® Card                                         ',720,	10000	,24		,10000			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Citi Premier® Card                                          ',690,	5000	,12		,60000			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Citi Rewards+® Card                                         ',670,	3000	,12		,40000			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Citi Double Cash Card                                       ',670,	2000	,12		,10000			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Citi Custom Cash® Card                                      ',670,	2000	,12		,10000			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Citi Diamond Preferred® Card                                ',670,	3000	,12		,10000			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Citi Simplicity® Card                                       ',670,	2000	,12		,20000			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Citi Rewards+® Student Card                                 ',670,	500	   ,6	,10000 			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Citi ThankYou® Preferred Card                               ',670,	1000	,6	,10000 			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Citi Secured Mastercard®                                   	',0,		0		,6	,20000	 			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Citi® Secured Mastercard® for Students						',0,		0		,6	,10000	 			);
+insert into credit_card_details(credit_card,minimum_credit_score,minimum_past_credit_limit,minimum_credit_history,minimum_income_requriement) 	values('Citi Rewards+® Secured Card									',0,		0		,6	,10000	 			);
@@ -0,0 +1,146 @@
+# dataset_cache.py
+#
+# Columnar cache for the CSV datasets. The first load of a CSV parses it and writes an
+# uncompressed Arrow IPC file named after the CSV's content hash; later loads memory-map
+# that file instead of parsing text, so numeric columns come back without copying.
+
+import hashlib
+import json
+import os
+import threading
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.environ.get("DATASET_CACHE_DIR", os.path.join(APP_DIR, ".dataset_cache"))
+
+# Rows parsed per step when converting a CSV
+CONVERT_CHUNKSIZE = 100000
+
+# (size, mtime) -> content hash, so unchanged files are not re-hashed on every load
+_HASH_INDEX = "hashes.json"
+_index_lock = threading.Lock()
+
+
+# CSV readers: each yields the file as DataFrames of `chunksize` rows
+
+def read_csv(path, chunksize):
+    return pd.read_csv(path, chunksize=chunksize)
+
+
+def read_final_dataset(path, chunksize):
+    return pd.read_csv(path, dtype={"ZipCode": str}, chunksize=chunksize)
+
+
+def read_raw_crx(path, chunksize):
+    import preprocessing
+    return preprocessing.read_raw(path, chunksize=chunksize)
+
+
+# How each known dataset is parsed; other CSVs use read_csv()
+READERS = {
+    "Final_dataset.csv": read_final_dataset,
+    "crx.csv": read_raw_crx,
+    "crx.data": read_raw_crx,
+}
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def content_hash(path):
+    stat = os.stat(path)
+    key = "{}:{}:{}".format(os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    index_path = os.path.join(CACHE_DIR, _HASH_INDEX)
+    with _index_lock:
+        try:
+            with open(index_path) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        if key not in index:
+            index[key] = _file_hash(path)
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(index_path, "w") as f:
+                json.dump(index, f)
+        return index[key]
+
+
+# Function to find one schema every chunk can be cast to. Numeric columns are widened as
+# needed (int64 -> double, an all-empty chunk's column -> any type); a column whose chunks
+# disagree otherwise (numbers in one, text in another) is stored as text.
+def _unified_schema(schemas):
+    try:
+        return pa.unify_schemas(schemas, promote_options="permissive")
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        pass
+    fields = []
+    for i, field in enumerate(schemas[0]):
+        try:
+            fields.append(pa.unify_schemas([pa.schema([schema.field(i)]) for schema in schemas],
+                                           promote_options="permissive").field(0))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            fields.append(field.with_type(pa.string()))
+    return pa.schema(fields, metadata=schemas[0].metadata)
+
+
+# Function to convert a CSV into an Arrow IPC file one chunk at a time. Column types are
+# inferred per chunk and a later chunk may need wider ones, so each chunk is first spilled
+# to its own Arrow file and all of them are cast to the unified schema at the end.
+def convert(path, arrow_path, reader, chunksize=CONVERT_CHUNKSIZE):
+    tmp_path = "{}.{}.tmp".format(arrow_path, os.getpid())
+    part_paths, schemas = [], []
+    try:
+        for chunk in reader(path, chunksize):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            part_paths.append("{}.{}".format(tmp_path, len(part_paths)))
+            with pa.OSFile(part_paths[-1], "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            schemas.append(table.schema)
+        with pa.OSFile(tmp_path, "wb") as sink:
+            if schemas:
+                schema = _unified_schema(schemas)
+                with pa.ipc.new_file(sink, schema) as writer:
+                    for part_path in part_paths:
+                        with pa.memory_map(part_path, "r") as source:
+                            table = pa.ipc.open_file(source).read_all()
+                            writer.write_table(table.cast(schema) if table.schema != schema else table)
+        os.replace(tmp_path, arrow_path)
+    finally:
+        for leftover in [tmp_path] + part_paths:
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+
+# Function to get the Arrow file for a CSV, converting it on first use
+def cached_path(path, reader=None):
+    reader = reader or READERS.get(os.path.basename(path), read_csv)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    arrow_path = os.path.join(CACHE_DIR, "{}-{}-{}.arrow".format(stem, reader.__name__, content_hash(path)))
+    if not os.path.exists(arrow_path):
+        convert(path, arrow_path, reader)
+    return arrow_path
+
+
+# Function to load a CSV dataset through the cache as a pandas DataFrame
+def load_dataset(path, reader=None):
+    source = pa.memory_map(cached_path(path, reader), "r")
+    table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+# Function to stream a CSV dataset through the cache in DataFrames of at most `chunksize` rows
+def iter_dataset(path, chunksize, reader=None):
+    source = pa.memory_map(cached_path(path, reader), "r")
+    file_reader = pa.ipc.open_file(source)
+    for i in range(file_reader.num_record_batches):
+        batch = file_reader.get_batch(i)
+        for start in range(0, batch.num_rows, chunksize):
+            yield batch.slice(start, chunksize).to_pandas(split_blocks=True)
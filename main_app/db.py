@@ -0,0 +1,120 @@
+# db.py
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2 import pool
+
+import query_trace
+
+# Storage backend: "postgres", or "sqlite" for the embedded stand-in in sqlite_backend.py
+DB_BACKEND = os.environ.get("DB_BACKEND", "postgres")
+
+# Database Connection settings (can be overridden through environment variables)
+
+DB_SETTINGS = {
+    "dbname": os.environ.get("DB_NAME", "creditcarddb"),
+    "user": os.environ.get("DB_USER", "postgresuser"),
+    "password": os.environ.get("DB_PASSWORD", "eQ3pPcYfReKXb6KdOloKTbeN0rvPYFsQ"),
+    "host": os.environ.get("DB_HOST", "dpg-clq6p89jvg7s73e3p5ag-a.ohio-postgres.render.com"),
+    "port": int(os.environ.get("DB_PORT", 5432)),
+}
+
+# Pool sizing
+POOL_MIN_SIZE = int(os.environ.get("DB_POOL_MIN_SIZE", 1))
+POOL_MAX_SIZE = int(os.environ.get("DB_POOL_MAX_SIZE", 10))
+
+# Connections idle for longer than this (in seconds) are pinged before being handed out
+POOL_HEALTH_CHECK_AFTER = float(os.environ.get("DB_POOL_HEALTH_CHECK_AFTER", 30))
+
+_pool = None
+_pool_lock = threading.Lock()
+_pool_slots = threading.BoundedSemaphore(POOL_MAX_SIZE)
+_last_used = {}
+
+
+# Function to get the process-wide connection pool (created on first use)
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = pool.ThreadedConnectionPool(POOL_MIN_SIZE, POOL_MAX_SIZE, **DB_SETTINGS)
+    return _pool
+
+
+# Function to check that a pooled connection is still usable
+def _is_healthy(conn):
+    if conn.closed:
+        return False
+    last_used = _last_used.get(id(conn))
+    if last_used is None or time.monotonic() - last_used < POOL_HEALTH_CHECK_AFTER:
+        return True
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        return True
+    except psycopg2.Error:
+        return False
+
+
+# Function to take a healthy connection out of the pool, reconnecting if needed.
+# Every idle connection may have gone stale together (e.g. after a database restart), so
+# replacements are checked too; once the idle ones are used up the pool opens new ones.
+def _checkout(db_pool):
+    for _ in range(POOL_MAX_SIZE + 1):
+        conn = db_pool.getconn()
+        if _is_healthy(conn):
+            break
+        _last_used.pop(id(conn), None)
+        db_pool.putconn(conn, close=True)
+    else:
+        raise psycopg2.OperationalError("No healthy database connection available")
+    # Every statement is its own transaction, so a read costs exactly one round trip
+    if not conn.autocommit:
+        conn.autocommit = True
+    return conn
+
+
+# Context manager handing out a pooled connection and returning it afterwards.
+# Blocks while all POOL_MAX_SIZE connections are in use.
+@contextmanager
+def get_connection():
+    if DB_BACKEND == "sqlite":
+        import sqlite_backend
+        yield query_trace.wrap(sqlite_backend.get_connection())
+        return
+    db_pool = get_pool()
+    _pool_slots.acquire()
+    try:
+        conn = _checkout(db_pool)
+    except Exception:
+        _pool_slots.release()
+        raise
+    broken = False
+    try:
+        yield query_trace.wrap(conn)
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        broken = True
+        raise
+    finally:
+        broken = broken or conn.closed
+        if broken:
+            _last_used.pop(id(conn), None)
+        else:
+            _last_used[id(conn)] = time.monotonic()
+        db_pool.putconn(conn, close=broken)
+        _pool_slots.release()
+
+
+# Function to close every pooled connection (e.g. on shutdown)
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+            _last_used.clear()
@@ -0,0 +1,168 @@
+# deploy.py
+#
+# Multi-process deployment: several Streamlit workers behind a local load balancer, plus
+# the pre-forked API server, all sharing one memory-mapped copy of the card catalog.
+#
+#   python deploy.py                                  one app and one API worker per CPU
+#   python deploy.py --app-workers 4 --api-workers 8 --port 8501 --api-port 8600
+#   APP_WORKERS=4 API_WORKERS=0 python deploy.py      same knobs from the environment
+#
+# The balancer is a TCP proxy that sends every client IP to the same Streamlit worker,
+# since a Streamlit session (its websocket and reconnects) lives in one process. The
+# schema, catalog and approval model are prepared once here before the workers start;
+# workers that exit are restarted.
+
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import zlib
+
+import tornado.ioloop
+import tornado.iostream
+import tornado.tcpclient
+import tornado.tcpserver
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+CPU_COUNT = os.cpu_count() or 1
+
+APP_WORKERS = int(os.environ.get("APP_WORKERS", CPU_COUNT))
+API_WORKERS = int(os.environ.get("API_WORKERS", CPU_COUNT))
+APP_PORT = int(os.environ.get("APP_PORT", 8501))
+API_PORT = int(os.environ.get("API_PORT", 8600))
+# Streamlit workers listen on localhost from this port upwards
+APP_BACKEND_PORT = int(os.environ.get("APP_BACKEND_PORT", 8510))
+SHARED_CACHE_DIR = os.environ.get("SHARED_CACHE_DIR", os.path.join(APP_DIR, ".shared_cache"))
+
+# Seconds between checks for exited workers
+SUPERVISE_INTERVAL = 1.0
+
+
+async def pipe(source, destination):
+    try:
+        while True:
+            data = await source.read_bytes(65536, partial=True)
+            await destination.write(data)
+    except tornado.iostream.StreamClosedError:
+        pass
+    finally:
+        destination.close()
+
+
+# TCP load balancer with client-IP affinity. If a client's worker is down, the next one takes it.
+class StickyBalancer(tornado.tcpserver.TCPServer):
+    def __init__(self, backends):
+        super().__init__()
+        self.backends = backends
+        self.client = tornado.tcpclient.TCPClient()
+
+    def candidates(self, address):
+        start = zlib.crc32(address[0].encode()) % len(self.backends)
+        return self.backends[start:] + self.backends[:start]
+
+    async def handle_stream(self, stream, address):
+        for host, port in self.candidates(address):
+            try:
+                upstream = await self.client.connect(host, port)
+                break
+            except (OSError, tornado.iostream.StreamClosedError):
+                continue
+        else:
+            stream.close()
+            return
+        await asyncio.gather(pipe(stream, upstream), pipe(upstream, stream))
+
+
+class Worker:
+    def __init__(self, name, command, env):
+        self.name = name
+        self.command = command
+        self.env = env
+        self.process = None
+
+    def start(self):
+        # Own process group, so stop() also reaches processes the worker forked itself
+        self.process = subprocess.Popen(self.command, env=self.env, cwd=APP_DIR, start_new_session=True)
+        print("Started {} (pid {})".format(self.name, self.process.pid))
+
+    def restart_if_exited(self):
+        if self.process.poll() is not None:
+            print("{} exited with {}, restarting".format(self.name, self.process.returncode))
+            self.start()
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            os.killpg(self.process.pid, signal.SIGTERM)
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                os.killpg(self.process.pid, signal.SIGKILL)
+
+
+# Function to bring the schema up to date and publish the catalog and model before any worker starts
+def prepare():
+    import approval_model
+    import card_catalog
+    import db
+    from migrations import bootstrap
+
+    bootstrap()
+    catalog = card_catalog.refresh_catalog()
+    approval_model.get_model()
+    db.close_pool()
+    print("Published catalog with {} cards to {}".format(len(catalog), SHARED_CACHE_DIR))
+
+
+def worker_env(app_workers):
+    env = dict(os.environ, SHARED_CACHE_DIR=SHARED_CACHE_DIR)
+    # Split the CPUs between the app workers' password hashing pools
+    env.setdefault("HASH_POOL_SIZE", str(max(1, CPU_COUNT // max(app_workers, 1))))
+    return env
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the app and API as several worker processes")
+    parser.add_argument("--app-workers", type=int, default=APP_WORKERS)
+    parser.add_argument("--api-workers", type=int, default=API_WORKERS, help="0: one per CPU, -1: no API server")
+    parser.add_argument("--port", type=int, default=APP_PORT, help="public port of the Streamlit app")
+    parser.add_argument("--api-port", type=int, default=API_PORT)
+    parser.add_argument("--backend-port", type=int, default=APP_BACKEND_PORT)
+    args = parser.parse_args()
+
+    os.environ["SHARED_CACHE_DIR"] = SHARED_CACHE_DIR
+    prepare()
+
+    env = worker_env(args.app_workers)
+    backends = [("127.0.0.1", args.backend_port + i) for i in range(args.app_workers)]
+    workers = [Worker("app worker {}".format(port),
+                      [sys.executable, "-m", "streamlit", "run", "main_app.py",
+                       "--server.port", str(port), "--server.address", host, "--server.headless", "true"],
+                      env)
+               for host, port in backends]
+    if args.api_workers >= 0:
+        # The API server forks its own workers onto one shared socket
+        workers.append(Worker("api server", [sys.executable, "api_server.py", "--port", str(args.api_port),
+                                             "--workers", str(args.api_workers)], env))
+    for worker in workers:
+        worker.start()
+
+    loop = tornado.ioloop.IOLoop.current()
+    if backends:
+        StickyBalancer(backends).listen(args.port)
+        print("Load balancer listening on port {} for {} app workers".format(args.port, len(backends)))
+    tornado.ioloop.PeriodicCallback(
+        lambda: [worker.restart_if_exited() for worker in workers], SUPERVISE_INTERVAL * 1000).start()
+
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.asyncio_loop.add_signal_handler(signum, loop.stop)
+    try:
+        loop.start()
+    finally:
+        for worker in workers:
+            worker.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,51 +1,20 @@
 # eligibility_check.py
 
 import streamlit as st
-import psycopg2
-#from main_app.main_app import SessionState  # Import SessionState from main_app
-
-# Database connection function
-def connect_db():
-    return psycopg2.connect(
-        dbname="creditcard",
-        user="postgres",
-        password="postgres",
-        host="localhost",
-        port=5432
-    )
+from card_catalog import get_catalog
+from db import get_connection  # Shared connection pool
 
 # Function to fetch user details based on email_id
 def get_user_details(email_id):
-    conn = connect_db()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM profile WHERE email_id = %s", (email_id,))
-    user_data = cursor.fetchone()
-    conn.close()
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM profile WHERE email_id = %s", (email_id,))
+        user_data = cursor.fetchone()
     return user_data
 
-# Function to check credit card eligibility
+# Function to check credit card eligibility against the card rules (see eligibility_rules.py)
 def check_eligibility(user_id, credit_score, credit_limit, credit_history, income_requirement):
-    conn = connect_db()
-    cursor = conn.cursor()
-
-    # Fetch user details
-    user_details = get_user_details(user_id)
-
-    # Check eligibility based on user_details and credit_card_details tables
-    cursor.execute("""
-        SELECT * FROM user_details u
-        JOIN credit_card_details c ON u.minimum_credit_score >= c.minimum_credit_score
-                                  AND u.minimum_credit_limit >= c.minimum_past_credit_limit
-                                  AND u.minimum_credit_history >= c.minimum_credit_history
-                                  AND u.minimum_income_requirement >= c.minimum_income_requirement
-        WHERE u.user_id = %s
-    """, (user_id,))
-
-    eligible_cards = cursor.fetchall()
-
-    conn.close()
-
-    return eligible_cards
+    return get_catalog().eligible_cards(credit_score, credit_limit, credit_history, income_requirement)
 
 # Eligibility Check Page
 def eligibility_check_page(session_state):
@@ -74,10 +43,8 @@ def eligibility_check_page(session_state):
             if eligible_cards:
                 st.success("Congratulations! You are eligible for the following credit cards:")
                 for card in eligible_cards:
-                    st.write(card[5])  # Assuming credit_card column is at index 5, adjust accordingly
+                    st.write(card[0])
             else:
                 st.warning("Sorry, you are not eligible for any credit cards.")
     else:
         st.error("User not found. Please log in with a valid email.")
-
-from main_app import SessionState
\ No newline at end of file
@@ -0,0 +1,252 @@
+# eligibility_rules.py
+#
+# Declarative per-card eligibility rules, stored as JSON in the credit_card_rules table and
+# compiled into interval matrices that card_catalog.py evaluates over the whole catalog.
+#
+#   python eligibility_rules.py --list
+#   python eligibility_rules.py --set "Platinum Card" rule.json
+#   python eligibility_rules.py --delete "Platinum Card"
+#   python eligibility_rules.py --check            compile every stored rule
+#
+# A rule is one of
+#   "thresholds"                                  the card's credit_card_details minimums
+#   {"field": "credit_score", "min": 650, "max": 800}
+#                                                 inclusive range, either bound optional
+#   {"all": [rule, ...]}    {"any": [rule, ...]}    {"not": rule}
+# with fields credit_score, credit_limit, credit_history and income_requirement (the user's
+# user_details values). Rules are matched to cards by name with surrounding whitespace
+# trimmed and inner runs collapsed, as catalog_import.py stores names; many seeded names
+# carry trailing padding. A card without a stored rule uses "thresholds", which is what the
+# four ">=" comparisons of the original SQL did. For example, a card open to high earners
+# regardless of history, and otherwise to anyone clearing its thresholds:
+#   {"any": ["thresholds", {"field": "income_requirement", "min": 150000}]}
+#
+# Every rule is rewritten into disjunctive normal form: a list of clauses, each an interval
+# [lower, upper] per field. All cards' clauses are stacked into two (clauses x fields)
+# matrices, so checking a user against every card is a handful of array operations no
+# matter how the rules are written.
+
+import argparse
+import json
+import re
+import sys
+
+import numpy as np
+
+from db import get_connection
+
+FIELDS = ("credit_score", "credit_limit", "credit_history", "income_requirement")
+
+# Clauses a single card's rule may expand to
+MAX_CLAUSES = 64
+
+DEFAULT_RULE = "thresholds"
+
+
+class RuleError(ValueError):
+    pass
+
+
+# Function to give the name a card's rule is stored and matched under
+def normalise_name(name):
+    return re.sub(r"\s+", " ", str(name)).strip()
+
+
+def _interval(field, minimum, maximum):
+    lower = np.full(len(FIELDS), -np.inf)
+    upper = np.full(len(FIELDS), np.inf)
+    index = FIELDS.index(field)
+    lower[index], upper[index] = minimum, maximum
+    return lower, upper
+
+
+# Function to AND two clause lists: every pair of clauses intersected, empty intervals dropped
+def _conjoin(left, right):
+    clauses = []
+    for lower_a, upper_a in left:
+        for lower_b, upper_b in right:
+            lower, upper = np.maximum(lower_a, lower_b), np.minimum(upper_a, upper_b)
+            if (lower <= upper).all():
+                clauses.append((lower, upper))
+    if len(clauses) > MAX_CLAUSES:
+        raise RuleError("rule expands to more than {} clauses".format(MAX_CLAUSES))
+    return clauses
+
+
+# Function to negate a clause list: NOT (c1 OR c2 ...) = (NOT c1) AND (NOT c2) ..., where a
+# clause is negated into one clause per bounded side of each field
+def _negate(clauses):
+    result = [(np.full(len(FIELDS), -np.inf), np.full(len(FIELDS), np.inf))]
+    for lower, upper in clauses:
+        complement = []
+        # Stepping past the largest float (a negated NULL minimum) gives inf, which is right
+        with np.errstate(over="ignore"):
+            for index, field in enumerate(FIELDS):
+                if lower[index] > -np.inf:
+                    complement.append(_interval(field, -np.inf, np.nextafter(lower[index], -np.inf)))
+                if upper[index] < np.inf:
+                    complement.append(_interval(field, np.nextafter(upper[index], np.inf), np.inf))
+        result = _conjoin(result, complement)
+    return result
+
+
+# Function to rewrite a rule as a list of (lower, upper) clauses; `thresholds` are the card's
+# credit_card_details minimums, with inf for NULL (a NULL minimum is never met)
+def to_clauses(rule, thresholds):
+    if rule == "thresholds":
+        return [(np.asarray(thresholds, dtype=float), np.full(len(FIELDS), np.inf))]
+    if not isinstance(rule, dict) or len(rule) == 0:
+        raise RuleError("expected \"thresholds\" or an object, got {!r}".format(rule))
+    if "field" in rule:
+        unknown = set(rule) - {"field", "min", "max"}
+        if unknown:
+            raise RuleError("unknown keys {}".format(", ".join(sorted(unknown))))
+        if rule["field"] not in FIELDS:
+            raise RuleError("unknown field {!r}, expected one of {}".format(rule["field"], ", ".join(FIELDS)))
+        bounds = []
+        for key, default in (("min", -np.inf), ("max", np.inf)):
+            value = rule.get(key, default)
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise RuleError("{} of {} must be a number".format(key, rule["field"]))
+            bounds.append(float(value))
+        if bounds[0] > bounds[1]:
+            return []
+        return [_interval(rule["field"], *bounds)]
+    if len(rule) != 1:
+        raise RuleError("expected one of field, all, any or not; got {}".format(", ".join(sorted(rule))))
+    (operator, operand), = rule.items()
+    if operator == "not":
+        return _negate(to_clauses(operand, thresholds))
+    if operator not in ("all", "any"):
+        raise RuleError("unknown operator {!r}".format(operator))
+    if not isinstance(operand, list):
+        raise RuleError("{} takes a list of rules".format(operator))
+    children = [to_clauses(child, thresholds) for child in operand]
+    if operator == "any":
+        clauses = [clause for child in children for clause in child]
+        if len(clauses) > MAX_CLAUSES:
+            raise RuleError("rule expands to more than {} clauses".format(MAX_CLAUSES))
+        return clauses
+    clauses = [(np.full(len(FIELDS), -np.inf), np.full(len(FIELDS), np.inf))]
+    for child in children:
+        clauses = _conjoin(clauses, child)
+    return clauses
+
+
+# Function to compile every card's rule into the arrays CardCatalog evaluates:
+#   lower, upper   (clauses x fields) inclusive bounds
+#   clause_card    card of each clause; clauses are grouped by card
+#   clause_start   first clause of each card (every card has at least one clause)
+# A rule that can never be met compiles to a single clause with an empty interval.
+def compile_rules(names, thresholds, rules=None):
+    rules = {normalise_name(name): rule for name, rule in (rules or {}).items()}
+    lowers, uppers, clause_card = [], [], []
+    for card, (name, card_thresholds) in enumerate(zip(names, thresholds)):
+        try:
+            clauses = to_clauses(rules.get(normalise_name(name), DEFAULT_RULE), card_thresholds)
+        except RuleError as e:
+            raise RuleError("rule for {}: {}".format(name, e))
+        if not clauses:
+            clauses = [(np.full(len(FIELDS), np.inf), np.full(len(FIELDS), -np.inf))]
+        for lower, upper in clauses:
+            lowers.append(lower)
+            uppers.append(upper)
+            clause_card.append(card)
+    clause_card = np.asarray(clause_card, dtype=np.int64)
+    return {
+        "lower": np.asarray(lowers, dtype=float).reshape(-1, len(FIELDS)),
+        "upper": np.asarray(uppers, dtype=float).reshape(-1, len(FIELDS)),
+        "clause_card": clause_card,
+        "clause_start": np.searchsorted(clause_card, np.arange(len(names))),
+    }
+
+
+# Function to read the stored rules as {credit_card: rule}
+def load_rules():
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT credit_card, rule FROM credit_card_rules")
+        rows = cursor.fetchall()
+    # JSONB comes back decoded from Postgres, as text from SQLite
+    return {name: json.loads(rule) if isinstance(rule, str) else rule for name, rule in rows}
+
+
+# Function to list the spellings a card's rule is stored under (rules saved before names
+# were normalised may still carry padding)
+def _stored_names(cursor, name):
+    cursor.execute("SELECT credit_card FROM credit_card_rules")
+    return [row[0] for row in cursor.fetchall() if normalise_name(row[0]) == name]
+
+
+# Function to store (or replace) the rule of a catalog card after checking that it compiles
+def save_rule(credit_card, rule):
+    to_clauses(rule, np.zeros(len(FIELDS)))
+    name = normalise_name(credit_card)
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT credit_card FROM credit_card_details")
+        if name not in {normalise_name(row[0]) for row in cursor.fetchall()}:
+            raise RuleError("no card named {!r} in credit_card_details".format(name))
+        for stored in _stored_names(cursor, name):
+            if stored != name:
+                cursor.execute("DELETE FROM credit_card_rules WHERE credit_card = %s", (stored,))
+        cursor.execute("""
+            INSERT INTO credit_card_rules (credit_card, rule)
+            VALUES (%s, %s)
+            ON CONFLICT (credit_card) DO UPDATE SET rule = EXCLUDED.rule
+        """, (name, json.dumps(rule)))
+
+
+# Function to delete a card's rule, so it falls back to its thresholds; False if it had none
+def delete_rule(credit_card):
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        stored = _stored_names(cursor, normalise_name(credit_card))
+        for name in stored:
+            cursor.execute("DELETE FROM credit_card_rules WHERE credit_card = %s", (name,))
+        return bool(stored)
+
+
+def main():
+    import card_catalog
+    from migrations import bootstrap
+
+    parser = argparse.ArgumentParser(description="Manage per-card eligibility rules")
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument("--list", action="store_true", help="print every stored rule")
+    action.add_argument("--set", nargs=2, metavar=("CARD", "RULE_FILE"), help="store a rule read from a JSON file")
+    action.add_argument("--delete", metavar="CARD", help="drop a card's rule")
+    action.add_argument("--check", action="store_true", help="compile every stored rule against the catalog")
+    args = parser.parse_args()
+    bootstrap()
+
+    if args.list:
+        for name, rule in sorted(load_rules().items()):
+            print("{}: {}".format(name, json.dumps(rule)))
+        return
+    if args.check:
+        rules = load_rules()
+        catalog = card_catalog.load_catalog()
+        unknown = sorted(set(map(normalise_name, rules)) - set(map(normalise_name, catalog.names)))
+        for name in unknown:
+            print("Rule for unknown card {}".format(name))
+        clauses = len(catalog.clause_card)
+        print("{} rules compiled to {} clauses over {} cards".format(len(rules), clauses, len(catalog)))
+        sys.exit(1 if unknown else 0)
+
+    if args.set:
+        name, path = args.set
+        with open(path) as f:
+            rule = json.load(f)
+        try:
+            save_rule(name, rule)
+        except RuleError as e:
+            raise SystemExit("Invalid rule: {}".format(e))
+        print("Stored the rule for {}".format(normalise_name(name)))
+    elif not delete_rule(args.delete):
+        raise SystemExit("No rule stored for {}".format(args.delete))
+    card_catalog.refresh_catalog()
+
+
+if __name__ == "__main__":
+    main()
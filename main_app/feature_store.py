@@ -0,0 +1,369 @@
+# feature_store.py
+#
+# Per-user feature vectors in one contiguous float64 array memory-mapped from
+# FEATURE_STORE_DIR, with a user_id -> row index. Columns are the four credit thresholds
+# from user_details followed by the approval model's Final_dataset.csv attributes (numeric
+# values as they are, categorical values as codes into a stored vocabulary); unknown values
+# are NaN. repository.py updates a user's thresholds after every user_details write, and
+# attributes are loaded from CSV files with --load-attributes, so reading a user's features
+# is an array slice instead of a query and re-encoding.
+#
+#   FEATURE_STORE_DIR=.feature_store python feature_store.py --rebuild   load every user_details row
+#   FEATURE_STORE_DIR=.feature_store python feature_store.py --load-attributes applicants.csv
+#                                         user_id plus any Final_dataset.csv columns, one row per user
+#   FEATURE_STORE_DIR=.feature_store python feature_store.py --user 42    print one user's features
+#
+# The files only ever grow in place, so every process mapping them sees the other
+# processes' writes; appends are serialised with a file lock. Disabled unless
+# FEATURE_STORE_DIR is set.
+
+import argparse
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+from approval_model import CATEGORICAL_FEATURES, NUMERIC_FEATURES
+from db import get_connection
+
+FEATURE_STORE_DIR = os.environ.get("FEATURE_STORE_DIR")
+ENABLED = bool(FEATURE_STORE_DIR)
+
+THRESHOLD_COLUMNS = ("credit_score", "credit_limit", "credit_history", "income_requirement")
+ATTRIBUTE_COLUMNS = NUMERIC_FEATURES + CATEGORICAL_FEATURES
+COLUMNS = THRESHOLD_COLUMNS + ATTRIBUTE_COLUMNS
+COLUMN_INDEX = {column: i for i, column in enumerate(COLUMNS)}
+
+INITIAL_CAPACITY = 1024
+ROW_BYTES = 8 * len(COLUMNS)
+# user_ids file value of a row that is not in use (database ids start at 1)
+EMPTY = 0
+
+
+class FeatureStore:
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._features_path = os.path.join(directory, "features.f64")
+        self._ids_path = os.path.join(directory, "user_ids.i64")
+        self._vocabulary_path = os.path.join(directory, "vocabulary.json")
+        with self._file_lock():
+            self._check_layout()
+            if not os.path.exists(self._features_path):
+                self._grow(INITIAL_CAPACITY)
+        self._map()
+        self._load_vocabulary()
+
+    @contextmanager
+    def _file_lock(self):
+        with open(os.path.join(self.directory, "lock"), "w") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _check_layout(self):
+        layout_path = os.path.join(self.directory, "columns.json")
+        if os.path.exists(layout_path):
+            with open(layout_path) as f:
+                if tuple(json.load(f)) != COLUMNS:
+                    raise ValueError("{} was built with other columns; run feature_store.py --rebuild".format(
+                        self.directory))
+        else:
+            with open(layout_path, "w") as f:
+                json.dump(COLUMNS, f)
+
+    # Extend both files in place to `capacity` rows (new rows are zero, i.e. unused)
+    def _grow(self, capacity):
+        for path, row_bytes in ((self._features_path, ROW_BYTES), (self._ids_path, 8)):
+            with open(path, "ab") as f:
+                f.truncate(capacity * row_bytes)
+
+    def _map(self):
+        capacity = os.path.getsize(self._ids_path) // 8
+        self.features = np.memmap(self._features_path, dtype=np.float64, mode="r+", shape=(capacity, len(COLUMNS)))
+        self.user_ids = np.memmap(self._ids_path, dtype=np.int64, mode="r+", shape=(capacity,))
+        # Plain ndarray view for reads: slicing it skips the memmap subclass bookkeeping
+        self._rows = self.features.view(np.ndarray)
+        self._rows.flags.writeable = False
+        self.index = {}
+        self._scanned = 0
+        self._scan()
+
+    # Pick up rows appended since the last scan, by this or another process
+    def _scan(self):
+        if os.path.getsize(self._ids_path) // 8 != len(self.user_ids):
+            return self._map()
+        new = self.user_ids[self._scanned:]
+        empty = np.flatnonzero(new == EMPTY)
+        count = empty[0] if len(empty) else len(new)
+        self.index.update(zip(new[:count].tolist(), range(self._scanned, self._scanned + count)))
+        self._scanned += count
+
+    def _load_vocabulary(self):
+        try:
+            with open(self._vocabulary_path) as f:
+                self.vocabulary = json.load(f)
+        except FileNotFoundError:
+            self.vocabulary = {}
+        # A store rebuilt after a categorical feature was added has no levels for it yet
+        for feature in CATEGORICAL_FEATURES:
+            self.vocabulary.setdefault(feature, [])
+
+    def _encode(self, feature, value):
+        levels = self.vocabulary[feature]
+        value = str(value)
+        if value not in levels:
+            # Called with the file lock held; re-read in case another process added levels
+            self._load_vocabulary()
+            levels = self.vocabulary[feature]
+            if value not in levels:
+                levels.append(value)
+                with open(self._vocabulary_path + ".tmp", "w") as f:
+                    json.dump(self.vocabulary, f)
+                os.replace(self._vocabulary_path + ".tmp", self._vocabulary_path)
+        return float(levels.index(value))
+
+    def row(self, user_id):
+        row = self.index.get(user_id)
+        if row is None:
+            with self._lock:
+                self._scan()
+            row = self.index.get(user_id)
+        return row
+
+    # The user's feature vector (a read-only view), or None for an unknown user
+    def vector(self, user_id):
+        row = self.row(user_id)
+        if row is None:
+            return None
+        return self._rows[row]
+
+    # The user's credit thresholds in check_eligibility() order; None where unknown
+    def thresholds(self, user_id):
+        vector = self.vector(user_id)
+        if vector is None:
+            return None
+        return tuple(None if np.isnan(value) else float(value) for value in vector[:len(THRESHOLD_COLUMNS)])
+
+    # The user's known Final_dataset.csv attributes, ready for ApprovalModel.predict()
+    def attributes(self, user_id):
+        vector = self.vector(user_id)
+        if vector is None:
+            return None
+        applicant = {}
+        for column in ATTRIBUTE_COLUMNS:
+            value = vector[COLUMN_INDEX[column]]
+            if np.isnan(value):
+                continue
+            if column in CATEGORICAL_FEATURES:
+                levels = self.vocabulary[column]
+                if int(value) >= len(levels):
+                    self._load_vocabulary()
+                    levels = self.vocabulary[column]
+                applicant[column] = levels[int(value)]
+            else:
+                applicant[column] = float(value)
+        return applicant
+
+    # Function to set some of a user's features (None clears a value); other columns keep their values
+    def put(self, user_id, **values):
+        self.put_many([(user_id, values)])
+
+    # Function to set features of many users under one lock: rows of (user_id, {column: value})
+    def put_many(self, rows):
+        rows = list(rows)
+        unknown = set(column for _, values in rows for column in values) - set(COLUMNS)
+        if unknown:
+            raise ValueError("Unknown feature columns: {}".format(", ".join(sorted(unknown))))
+        with self._lock, self._file_lock():
+            self._scan()
+            for user_id, values in rows:
+                self._put(user_id, values)
+
+    # Called with both locks held
+    def _put(self, user_id, values):
+        row = self.index.get(user_id)
+        new = row is None
+        if new:
+            row = self._scanned
+            if row == len(self.user_ids):
+                self._grow(2 * len(self.user_ids))
+                self._map()
+            self.features[row] = np.nan
+        for column, value in values.items():
+            if value is None:
+                value = np.nan
+            elif column in CATEGORICAL_FEATURES:
+                value = self._encode(column, value)
+            self.features[row, COLUMN_INDEX[column]] = value
+        if new:
+            # Publish the row only once its values are written
+            self.user_ids[row] = user_id
+            self._scan()
+
+    # Function to mark a user's thresholds unknown, so readers fall back to the database.
+    # Used when put() failed part way; it only overwrites the row in place, so it takes no
+    # file lock and works when the lock or a file append is what failed.
+    def invalidate(self, user_id):
+        row = self.row(user_id)
+        if row is not None:
+            self.features[row, :len(THRESHOLD_COLUMNS)] = np.nan
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+# Function to get the process-wide store, or None when FEATURE_STORE_DIR is not set
+def get_store():
+    global _store
+    if _store is None and ENABLED:
+        with _store_lock:
+            if _store is None:
+                _store = FeatureStore(FEATURE_STORE_DIR)
+    return _store
+
+
+# Function to mirror a user_details write (called by repository.py); None values clear the row
+def record_credit_information(user_id, credit_score=None, credit_limit=None, credit_history=None,
+                              income_requirement=None):
+    store = get_store()
+    if store is None:
+        return
+    try:
+        store.put(user_id, credit_score=credit_score, credit_limit=credit_limit,
+                  credit_history=credit_history, income_requirement=income_requirement)
+    except Exception as e:
+        # The database write already succeeded; drop the user's old thresholds rather than
+        # serve them, and --rebuild restores the row
+        print(f"Feature store update failed for user {user_id}: {e}")
+        try:
+            store.invalidate(user_id)
+        except Exception as e:
+            print(f"Feature store invalidation failed for user {user_id}: {e}")
+
+
+# Function to store users' Final_dataset.csv-style attributes from a CSV with a user_id
+# column and any of ATTRIBUTE_COLUMNS (other columns, such as Approved, are ignored). Empty
+# cells clear a value; columns missing from the file keep theirs. Returns the number of rows.
+def load_attributes(path, chunksize=10000):
+    # Imported here so that the app and the API do not load pandas for the store
+    import pandas as pd
+
+    store = get_store()
+    if store is None:
+        raise ValueError("Set FEATURE_STORE_DIR to use the feature store")
+    count = 0
+    for chunk in pd.read_csv(path, dtype={"ZipCode": str}, chunksize=chunksize):
+        if "user_id" not in chunk:
+            raise ValueError("{} has no user_id column".format(path))
+        columns = [column for column in ATTRIBUTE_COLUMNS if column in chunk]
+        data = {}
+        for column in columns:
+            values = chunk[column] if column in CATEGORICAL_FEATURES else pd.to_numeric(chunk[column])
+            data[column] = values.astype(object).where(values.notna(), None).tolist()
+        user_ids = chunk["user_id"].astype(np.int64).tolist()
+        store.put_many((user_id, {column: data[column][i] for column in columns})
+                       for i, user_id in enumerate(user_ids))
+        count += len(user_ids)
+    return count
+
+
+# Function to read an existing store's files with the columns they were written with (which
+# differ from COLUMNS when the model's features changed); None if there is no usable store
+def _read_old_store(directory):
+    features_path = os.path.join(directory, "features.f64")
+    ids_path = os.path.join(directory, "user_ids.i64")
+    if not (os.path.exists(features_path) and os.path.exists(ids_path)):
+        return None
+    columns = COLUMNS
+    layout_path = os.path.join(directory, "columns.json")
+    if os.path.exists(layout_path):
+        with open(layout_path) as f:
+            columns = tuple(json.load(f))
+    user_ids = np.fromfile(ids_path, dtype=np.int64)
+    features = np.fromfile(features_path, dtype=np.float64)
+    if len(features) != len(user_ids) * len(columns):
+        print("Ignoring the old feature store in {}: its files do not match columns.json".format(directory))
+        return None
+    return columns, user_ids, features.reshape(len(user_ids), len(columns))
+
+
+# Function to recreate the store from every user_details row, keeping the attributes already
+# stored for those users (those columns that are still in COLUMNS). Workers mapping the old
+# files keep reading them until restarted.
+def rebuild(directory=FEATURE_STORE_DIR):
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT user_id, minimum_credit_score, minimum_credit_limit,
+                   minimum_credit_history, minimum_income_requirement
+            FROM user_details
+            ORDER BY user_id
+        """)
+        rows = cursor.fetchall()
+    capacity = max(INITIAL_CAPACITY, 1 << max(len(rows) - 1, 0).bit_length())
+    features = np.full((capacity, len(COLUMNS)), np.nan)
+    user_ids = np.zeros(capacity, dtype=np.int64)
+    if rows:
+        data = np.array([[np.nan if value is None else value for value in row] for row in rows], dtype=float)
+        user_ids[:len(rows)] = data[:, 0]
+        features[:len(rows), :len(THRESHOLD_COLUMNS)] = data[:, 1:]
+    old = _read_old_store(directory)
+    if old is not None:
+        old_columns, old_ids, old_features = old
+        kept = [column for column in ATTRIBUTE_COLUMNS if column in old_columns]
+        source = [old_columns.index(column) for column in kept]
+        target = [COLUMN_INDEX[column] for column in kept]
+        old_rows = {user_id: row for row, user_id in enumerate(old_ids.tolist()) if user_id != EMPTY}
+        for row, user_id in enumerate(user_ids[:len(rows)].tolist()):
+            old_row = old_rows.get(user_id)
+            if old_row is not None:
+                features[row, target] = old_features[old_row, source]
+    os.makedirs(directory, exist_ok=True)
+    for name, array in (("features.f64", features), ("user_ids.i64", user_ids)):
+        path = os.path.join(directory, name)
+        array.tofile(path + ".tmp")
+        os.replace(path + ".tmp", path)
+    # Written last: a store is only opened with the new layout once its files have it
+    layout_path = os.path.join(directory, "columns.json")
+    with open(layout_path + ".tmp", "w") as f:
+        json.dump(COLUMNS, f)
+    os.replace(layout_path + ".tmp", layout_path)
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-user feature store")
+    parser.add_argument("--rebuild", action="store_true", help="reload every user_details row from the database")
+    parser.add_argument("--load-attributes", metavar="CSV", help="store the Final_dataset.csv-style attributes in a CSV")
+    parser.add_argument("--user", type=int, help="print one user's features")
+    args = parser.parse_args()
+    if not ENABLED:
+        raise SystemExit("Set FEATURE_STORE_DIR to use the feature store")
+
+    if args.rebuild:
+        print("Stored features of {} users in {}".format(rebuild(), FEATURE_STORE_DIR))
+    if args.load_attributes:
+        try:
+            count = load_attributes(args.load_attributes)
+        except ValueError as e:
+            raise SystemExit("Could not load {}: {}".format(args.load_attributes, e))
+        print("Stored attributes of {} users in {}".format(count, FEATURE_STORE_DIR))
+    if args.user is not None:
+        store = get_store()
+        vector = store.vector(args.user)
+        if vector is None:
+            raise SystemExit("No features stored for user {}".format(args.user))
+        for column, value in zip(COLUMNS, vector.tolist()):
+            print("{:<20} {}".format(column, value))
+
+
+if __name__ == "__main__":
+    main()
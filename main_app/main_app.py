@@ -1,64 +1,13 @@
 # main_app.py
 
 import streamlit as st
-import psycopg2
-from passlib.hash import pbkdf2_sha256
-import pandas as pd
-# Database Connection
-
-def connect_db():
-    return psycopg2.connect(
-        # dbname="creditcard",
-        # user="postgres",
-        # password="postgres",
-        # host="localhost",
-        # port=5432
-        dbname="creditcarddb",
-        user="postgresuser",
-        password="eQ3pPcYfReKXb6KdOloKTbeN0rvPYFsQ",
-        host="dpg-clq6p89jvg7s73e3p5ag-a.ohio-postgres.render.com",
-        port=5432
-
-    )
-
-# Create tables
-
-def create_tables():
-    conn = connect_db()
-    cursor = conn.cursor()
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS profile 
-        (
-            id SERIAL PRIMARY KEY,
-            first_name VARCHAR(100),
-            last_name VARCHAR(100),
-            email_id VARCHAR(100) NOT NULL UNIQUE,
-            password VARCHAR(100),
-            phone_number BIGINT NOT NULL,
-            address VARCHAR(100)
-        );
-        CREATE TABLE IF NOT EXISTS user_details
-        (
-            user_id INT REFERENCES profile(id),
-            minimum_credit_score INT,
-            minimum_credit_limit INT,
-            minimum_credit_history INT,
-            minimum_income_requirement INT
-        );
-    ''')
-    conn.commit()
-    conn.close()
-
-# Function to hash passwords
-
-def hash_password(password):
-    return pbkdf2_sha256.hash(password)
-
-# Function to verify passwords
-
-def verify_password(plain_password, hashed_password):
-    return pbkdf2_sha256.verify(plain_password, hashed_password)
-
+import caching
+from migrations import bootstrap
+from passwords import verify_and_update
+from repository import (
+    create_user, get_user_record, update_password_hash, verify_credentials, get_user_details,
+    retrive_credit_information, create_credit_profile, update_user_credit_information,
+    delete_credit_information)
 
 # Define SessionState class
 class SessionState:
@@ -77,6 +26,8 @@ def init_session_state():
         st.session_state.updated_credit_history = None
         st.session_state.updated_income_requirement = None
         st.session_state.user_id = None  # Add this line to initialize user_id
+        st.session_state.user = None  # User record cached at login
+        st.session_state.eligibility = None  # Last eligibility mask, for incremental updates
 
 
 # SignUp Page
@@ -100,39 +51,6 @@ def signup():
         else:
             st.error("Email Id already exists")
 
-# Function to create a new user
-
-def create_user(first_name, last_name, email_id, new_password, address, phone_number):
-    # Function to create a new user
-    conn = connect_db()
-    cursor = conn.cursor()
-
-    try:
-        # Check if the username already exists
-        cursor.execute(
-            "SELECT * FROM profile WHERE email_id = %s", (email_id,))
-        existing_user = cursor.fetchone()
-
-        if existing_user:
-            return False
-
-        # Insert new user into the profile table
-        hashed_password = hash_password(new_password)
-        cursor.execute("INSERT INTO profile (first_name, last_name, email_id, password, phone_number, address) VALUES (%s, %s, %s, %s, %s, %s)",
-                       (first_name, last_name, email_id, hashed_password, phone_number, address))
-
-        conn.commit()
-        return True
-
-    except Exception as e:
-        print(f"An error occurred: {e}")
-        conn.rollback()
-        return False
-
-    finally:
-        conn.close()
-
-
 # Login
 def login():
     st.subheader("Login")
@@ -143,53 +61,69 @@ def login():
 
     # Check if the user has clicked the "Login" button
     if st.button("Login"):
-        # Verify credentials
-        if verify_credentials(email_id, password):
+        # Verify credentials and load the user record in one query
+        user = login_user(email_id, password)
+        if user:
             st.session_state.logged_in = True
             st.session_state.email_id = email_id
+            st.session_state.user = user
+            st.session_state.user_id = user["id"]
             st.success("Logged in as {}".format(email_id))
-            user_details = get_user_details(email_id)
-            if user_details:
-                user_id=user_details[0]
-                user_info=retrive_credit_information(user_id)
-
-                if user_info: 
-                    # Display credit information for returning users
-                    st.header("User Credit information")
-                    st.info("Please click on login button again to update credit information for eligibility check")
-                    st.write("Existing Credit Score:", user_info[0][1])
-                    st.write("Existing Credit Limit::", user_info[0][2])
-                    st.write("Existing Credit History:", user_info[0][3])
-                    st.write("Existing Income:", user_info[0][4])
-                else:
-                    # Display welcome message for first-time users
-                    st.info("Welcome to the Credit Card Eligibility Check Application. Please click on login button again to insert credit information for eligibility check")
+
+            if has_credit_information(user):
+                # Display credit information for returning users
+                st.header("User Credit information")
+                st.info("Please click on login button again to update credit information for eligibility check")
+                st.write("Existing Credit Score:", user["credit_score"])
+                st.write("Existing Credit Limit::", user["credit_limit"])
+                st.write("Existing Credit History:", user["credit_history"])
+                st.write("Existing Income:", user["income_requirement"])
+            else:
+                # Display welcome message for first-time users
+                st.info("Welcome to the Credit Card Eligibility Check Application. Please click on login button again to insert credit information for eligibility check")
         else:
             st.error("Invalid credentials")
 
-def retrive_credit_information(user_id):
-    conn = connect_db()
-    cursor = conn.cursor()
-    # Check if the username already exists
-    cursor.execute(
-        "SELECT * FROM user_details WHERE user_id = %s", (user_id,))
-    existing_user = cursor.fetchall()
-    conn.close()
-    return existing_user if existing_user else None
-
-def verify_credentials(email_id, password):
-    conn = connect_db()
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT email_id, password FROM profile WHERE email_id = %s", (email_id,))
-    user_data = cursor.fetchone()
-    conn.close()
-
-    if user_data and verify_password(password, user_data[1]):
-        return True
-    else:
-        return False
-
+# Function to verify credentials and return the user record (without password) on success
+
+def login_user(email_id, password):
+    user = get_user_record(email_id)
+    if user is None:
+        return None
+    verified, new_hash = verify_and_update(password, user.pop("password"))
+    if not verified:
+        return None
+    if new_hash:
+        # Stored hash used outdated pbkdf2 parameters
+        update_password_hash(user["id"], new_hash)
+    return user
+
+def has_credit_information(user):
+    return user["credit_score"] is not None
+
+# Function to get the logged in user's record from session state, reloading it if missing
+
+def get_session_user(email_id):
+    user = st.session_state.get("user")
+    if user is None or user["email_id"] != email_id:
+        user = get_user_record(email_id)
+        if user is None:
+            # The account was deleted or its email changed since login
+            clear_session_state()
+            st.error("Your account could not be found. Please log in again.")
+            st.stop()
+        user.pop("password")
+        st.session_state.user = user
+        st.session_state.user_id = user["id"]
+    return user
+
+# Function to keep the cached user record in step with user_details after a write
+
+def set_session_credit_information(credit_score=None, credit_limit=None, credit_history=None, income_requirement=None):
+    user = st.session_state.get("user")
+    if user is not None:
+        user.update(credit_score=credit_score, credit_limit=credit_limit,
+                    credit_history=credit_history, income_requirement=income_requirement)
 
 # Function to display credit details form
 def credit_details(email_id):
@@ -204,71 +138,94 @@ def credit_details(email_id):
         "Minimum Income Requirement", value=30000)
 
     if st.button("INSERT DETAILS AND CHECK ELIGIBILITY"):
-        user_data = get_user_details(email_id)
-        user_id = user_data[0]
+        user_id = get_session_user(email_id)["id"]
         create_profile_flag = create_credit_profile(
             user_id, min_credit_score, min_credit_limit, min_credit_history, min_income_requirement)
         if create_profile_flag:
-            eligible_cards = check_eligibility(
-                user_id, min_credit_score, min_credit_limit, min_credit_history, min_income_requirement)
+            set_session_credit_information(
+                min_credit_score, min_credit_limit, min_credit_history, min_income_requirement)
+            update_session_eligibility(
+                None, (min_credit_score, min_credit_limit, min_credit_history, min_income_requirement))
+            results = rank_session_eligibility()
         else:
             st.warning("You have already inserted your information once. Please Update your information from side bar")
             return
-        if eligible_cards:
-            #List
-            st.header("Eligible Credit Cards")
-            for i, card in enumerate(eligible_cards, 1):
-                st.write(f"{i}. {card[0]}")
-        else:
-            st.warning("No eligible credit cards found.")
-
-def create_credit_profile(user_id, credit_score, credit_limit, credit_history, income_requirement):
-    conn = connect_db()
-    cursor = conn.cursor()
-    # Check if the username already exists
-    cursor.execute(
-        "SELECT * FROM user_details WHERE user_id = %s", (user_id,))
-    existing_user = cursor.fetchone()
-    if existing_user:
-        return False
-    cursor.execute("INSERT INTO user_details (user_id, minimum_credit_score, minimum_credit_limit, minimum_credit_history, minimum_income_requirement) VALUES (%s, %s, %s, %s, %s)",
-                   (user_id, credit_score, credit_limit, credit_history, income_requirement))
-    conn.commit()
-    conn.close()
-    return True
-
-# Function to fetch user details based on email_id
-
-def get_user_details(email_id):
-    conn = connect_db()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM profile WHERE email_id = %s", (email_id,))
-    user_data = cursor.fetchone()
-    conn.close()
-    return user_data
-
+        show_eligibility_results(results, "No eligible credit cards found.")
 
 # Function to check credit card eligibility
 def check_eligibility(user_id, credit_score, credit_limit, credit_history, income_requirement):
-    conn = connect_db()
-    cursor = conn.cursor()
-
-    # Check eligibility based on user_details and credit_card_details tables
-    cursor.execute("""
-        SELECT credit_card FROM user_details u
-        JOIN credit_card_details c ON u.minimum_credit_score >= c.minimum_credit_score
-                                  AND u.minimum_credit_limit >= c.minimum_past_credit_limit
-                                  AND u.minimum_credit_history >= c.minimum_credit_history
-                                  AND u.minimum_income_requirement >= c.minimum_income_requriement
-        WHERE u.user_id = %s
-    """, (user_id,))
-
-    eligible_cards = cursor.fetchall()
-
-    conn.close()
+    # Check eligibility against the cached copy of the credit_card_details table
+    eligible_cards = caching.eligible_cards(
+        credit_score, credit_limit, credit_history, income_requirement)
 
     return eligible_cards
 
+# Function to work out the eligible cards for new credit values from the result kept in the
+# session for the previous values; only cards whose thresholds lie between a field's old and
+# new value are re-checked. Returns (previous mask, new mask) over the catalog.
+def update_session_eligibility(previous_values, values):
+    catalog = caching.catalog()
+    last = st.session_state.get("eligibility")
+    if previous_values is None:
+        last = None
+    elif last is None or last["catalog"] is not catalog or last["values"] != previous_values:
+        last = {"catalog": catalog, "values": previous_values, "mask": catalog.eligible_mask(*previous_values)}
+    if last is None:
+        mask = catalog.eligible_mask(*values)
+    else:
+        mask, _ = catalog.update_mask(last["mask"], previous_values, values)
+    st.session_state.eligibility = {"catalog": catalog, "values": values, "mask": mask}
+    return (last["mask"] if last else None), mask
+
+# Function to list the cards gained and lost between two eligibility masks
+def show_eligibility_changes(previous_mask, mask):
+    names = caching.catalog().names
+    gained = [names[i].strip() for i in range(len(names)) if mask[i] and not previous_mask[i]]
+    lost = [names[i].strip() for i in range(len(names)) if previous_mask[i] and not mask[i]]
+    if gained:
+        st.write("Newly eligible: " + ", ".join(gained))
+    if lost:
+        st.write("No longer eligible: " + ", ".join(lost))
+
+# Function to get eligible cards best offer first, plus near misses, with per-threshold margins
+def rank_eligibility(credit_score, credit_limit, credit_history, income_requirement):
+    return caching.ranked_eligibility(
+        credit_score, credit_limit, credit_history, income_requirement)
+
+# Function to rank the cards for the values kept in the session by update_session_eligibility();
+# eligibility comes from the session mask, so only the eligible cards and near misses are scored
+def rank_session_eligibility():
+    eligibility = st.session_state.eligibility
+    return eligibility["catalog"].ranked_eligibility(*eligibility["values"], mask=eligibility["mask"])
+
+MARGIN_LABELS = {
+    "minimum_credit_score": "credit score",
+    "minimum_past_credit_limit": "credit limit",
+    "minimum_credit_history": "credit history",
+    "minimum_income_requriement": "income",
+}
+
+# Function to describe the thresholds a near-miss card fails, e.g. "credit score short by 10"
+def describe_shortfall(margins):
+    return ", ".join("{} short by {:,.0f}".format(MARGIN_LABELS[column], -margin)
+                     for column, margin in margins.items() if margin is not None and margin < 0)
+
+# Function to list ranked eligibility results: eligible cards first, then the ones just out of reach
+def show_eligibility_results(results, empty_message):
+    eligible = [result for result in results if result["eligible"]]
+    near_misses = [result for result in results if not result["eligible"]]
+    if eligible:
+        #List
+        st.header("Eligible Credit Cards")
+        for i, result in enumerate(eligible, 1):
+            st.write(f"{i}. {result['credit_card'].strip()}")
+    else:
+        st.warning(empty_message)
+    if near_misses:
+        st.subheader("Almost eligible")
+        for result in near_misses:
+            st.write(f"- {result['credit_card'].strip()} ({describe_shortfall(result['margins'])})")
+
 # Update Credit Information
 
 
@@ -287,93 +244,50 @@ def update_credit_information(email_id):
 
     # Check if the user has clicked the "Update" button
     if st.button("UPDATE DETAILS AND CHECK ELIGIBILITY"):
-        user_data = get_user_details(email_id)
-        user_id = user_data[0]
+        user = get_session_user(email_id)
+        values = (updated_credit_score, updated_credit_limit, updated_credit_history, updated_income_requirement)
+        previous_values = (user["credit_score"], user["credit_limit"], user["credit_history"], user["income_requirement"])
+        had_credit_information = has_credit_information(user)
+        if had_credit_information and values == previous_values:
+            # Nothing changed: no database write, same cards as before
+            st.info("Your credit details are unchanged.")
+            show_eligibility_results(rank_eligibility(*values), "Still not eligible for any of the credit cards.")
+            return
         # Call the function to update credit information
         update_flag = update_user_credit_information(
-            user_id, updated_credit_score, updated_credit_limit, updated_credit_history, updated_income_requirement)
+            user["id"], updated_credit_score, updated_credit_limit, updated_credit_history, updated_income_requirement)
         if update_flag:
-            new_eligible_cards = check_eligibility(user_id, updated_credit_score, updated_credit_limit, updated_credit_history, updated_income_requirement)
+            set_session_credit_information(
+                updated_credit_score, updated_credit_limit, updated_credit_history, updated_income_requirement)
+            previous_mask, mask = update_session_eligibility(
+                previous_values if had_credit_information else None, values)
+            results = rank_session_eligibility()
             st.success("Credit information updated successfully")
+            if previous_mask is not None:
+                show_eligibility_changes(previous_mask, mask)
         else:
             st.error("Credit Details for this user are unavailable.Please select Credit Detials Option from Side Bar.")
             return
-        if new_eligible_cards:
-            #List
-            st.header("Eligible Credit Cards")
-            for i, card in enumerate(new_eligible_cards, 1):
-                st.write(f"{i}. {card[0]}")
-        else:
-            st.warning("Still not eligible for any of the credit cards.")
-
-# Function to update user's credit information
-
-def update_user_credit_information(user_id, updated_credit_score, updated_credit_limit, updated_credit_history, updated_income_requirement):
-    conn = connect_db()
-    cursor = conn.cursor()
-    try:
-        # Update user_details table with the new credit information
-        
-        #Check if user present or not
-        cursor.execute(
-        "SELECT * FROM user_details WHERE user_id = %s", (user_id,))
-        existing_user = cursor.fetchone()
-        if existing_user:
-            cursor.execute("""
-                UPDATE user_details
-                SET minimum_credit_score = %s,
-                    minimum_credit_limit = %s,
-                    minimum_credit_history = %s,
-                    minimum_income_requirement = %s
-                WHERE user_id = %s
-            """, (updated_credit_score, updated_credit_limit, updated_credit_history, updated_income_requirement, user_id))
-            conn.commit()
-            conn.close()
-            return True
-        return False
-
-    except Exception as e:
-        print(f"An error occurred: {e}")
-        conn.rollback()
-        return Fallitse
-
-    finally:
-        conn.close()
-
-def delete_credit_information(user_id):
-    conn = connect_db()
-    cursor = conn.cursor()
-    #delete_flag = 0
-    # Check if the username already exists
-    cursor.execute(
-        "SELECT * FROM user_details WHERE user_id = %s", (user_id,))
-    existing_user = cursor.fetchone()
-    if existing_user:
-        cursor.execute("DELETE FROM user_details where user_id = %s",
-                   (user_id,))
-        conn.commit()
-        conn.close()
-        return True
-    return False
+        show_eligibility_results(results, "Still not eligible for any of the credit cards.")
 
 def delete_information(email_id):
     st.header("Do you really want to delete credit information")
     # Input fields for updating credit information
     # Check if the user has clicked the "Update" button
     if st.button("DELETE CREDIT DETAILS"):
-        user_data = get_user_details(email_id)
-        user_id = user_data[0]
+        user_id = get_session_user(email_id)["id"]
         # Call the function to update credit information
         deleted_flag = delete_credit_information(user_id)
         if deleted_flag:
+            set_session_credit_information()
+            st.session_state.eligibility = None
             st.success(
                 "Deleted credit information for user with mail  {} sucessfully".format(email_id))
         else:
             st.error("Your Credit information is unavailalbe with us.")
 
-# Logout function
-def logout():
-    # Reset session state on logout
+# Function to reset the session to logged out
+def clear_session_state():
     st.session_state.logged_in = False
     st.session_state.email_id = None
     st.session_state.updated_credit_score = None
@@ -381,10 +295,22 @@ def logout():
     st.session_state.updated_credit_history = None
     st.session_state.updated_income_requirement = None
     st.session_state.user_id = None
+    st.session_state.user = None
+    st.session_state.eligibility = None
+
+# Logout function
+def logout():
+    # Reset session state on logout
+    clear_session_state()
     st.sidebar.success("Logged out successfully. Please select Logout button again from dropdown to be directed to Login Page.")
 
 
 def main():
+    # Bring the database schema up to date (runs once per process)
+    bootstrap()
+    caching.connection_pool()  # open the shared connection pool once per server process
+    caching.handle_admin_invalidation()
+
     # Initialize session state
     init_session_state()
 
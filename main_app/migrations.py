@@ -0,0 +1,177 @@
+# migrations.py
+#
+# Versioned schema migrations. Applied versions are recorded in schema_migrations,
+# so bootstrap() is idempotent and only runs what is missing.
+#
+#   python migrations.py          apply pending migrations
+#   python migrations.py --status list applied versions
+
+import sys
+import threading
+
+import db
+from db import get_connection
+
+# Arbitrary key for the advisory lock that serialises concurrent bootstraps
+MIGRATION_LOCK_KEY = 720431
+
+# Indexes on credit_card_details (also re-created by catalog_import.py after a catalog swap)
+CATALOG_INDEXES = """
+    CREATE INDEX IF NOT EXISTS credit_card_details_thresholds_idx ON credit_card_details
+        (minimum_credit_score, minimum_past_credit_limit, minimum_credit_history, minimum_income_requriement);
+    CREATE INDEX IF NOT EXISTS credit_card_details_income_idx ON credit_card_details
+        (minimum_income_requriement, minimum_credit_score);
+"""
+
+# credit_card_details.sql used to store credit history in years (0.5, 1 or 2; Postgres
+# rounded 0.5 up to 1). The app and catalog_import.py use months, so a catalog still holding
+# only values of at most 2 was loaded from that script and is converted.
+CATALOG_HISTORY_TO_MONTHS = """
+    UPDATE credit_card_details SET minimum_credit_history = minimum_credit_history * 12
+    WHERE (SELECT MAX(minimum_credit_history) FROM credit_card_details) <= 2;
+"""
+
+MIGRATIONS = [
+    (1, "create base tables", """
+        CREATE TABLE IF NOT EXISTS profile
+        (
+            id SERIAL PRIMARY KEY,
+            first_name VARCHAR(100),
+            last_name VARCHAR(100),
+            email_id VARCHAR(100) NOT NULL UNIQUE,
+            password VARCHAR(100),
+            phone_number BIGINT NOT NULL,
+            address VARCHAR(100)
+        );
+        CREATE TABLE IF NOT EXISTS user_details
+        (
+            user_id INT REFERENCES profile(id),
+            minimum_credit_score INT,
+            minimum_credit_limit INT,
+            minimum_credit_history INT,
+            minimum_income_requirement INT
+        );
+        CREATE TABLE IF NOT EXISTS credit_card_details
+        (
+            credit_card VARCHAR(100),
+            minimum_credit_score INT,
+            minimum_past_credit_limit INT,
+            minimum_credit_history INT,
+            minimum_income_requriement INT
+        );
+    """),
+    (2, "reconcile column names with DB_Script.txt", """
+        DO $$
+        BEGIN
+            -- Tables created from the old DB_Script.txt
+            IF EXISTS (SELECT 1 FROM information_schema.columns
+                       WHERE table_schema = current_schema() AND table_name = 'credit_card_details'
+                         AND column_name = 'minimum_credit_limit') THEN
+                ALTER TABLE credit_card_details RENAME COLUMN minimum_credit_limit TO minimum_past_credit_limit;
+            END IF;
+            IF EXISTS (SELECT 1 FROM information_schema.columns
+                       WHERE table_schema = current_schema() AND table_name = 'credit_card_details'
+                         AND column_name = 'minimum_income_requirement') THEN
+                ALTER TABLE credit_card_details RENAME COLUMN minimum_income_requirement TO minimum_income_requriement;
+            END IF;
+            IF EXISTS (SELECT 1 FROM information_schema.columns
+                       WHERE table_schema = current_schema() AND table_name = 'profile'
+                         AND column_name = 'pwd') THEN
+                ALTER TABLE profile RENAME COLUMN pwd TO password;
+            END IF;
+        END $$;
+        ALTER TABLE profile ADD COLUMN IF NOT EXISTS last_name VARCHAR(100);
+        ALTER TABLE profile ALTER COLUMN first_name TYPE VARCHAR(100);
+        ALTER TABLE profile ALTER COLUMN password TYPE VARCHAR(100);
+        ALTER TABLE profile ALTER COLUMN phone_number TYPE BIGINT;
+    """),
+    (3, "primary key on user_details.user_id", """
+        DELETE FROM user_details WHERE user_id IS NULL;
+        -- Keep one row of any duplicates: the one at the highest physical position (ctid).
+        -- user_details records neither an id nor a write time, so this is not necessarily
+        -- the latest write; it only makes the choice deterministic.
+        DELETE FROM user_details a USING user_details b
+        WHERE a.user_id = b.user_id AND a.ctid < b.ctid;
+        ALTER TABLE user_details DROP CONSTRAINT IF EXISTS user_details_user_id_key;
+        DROP INDEX IF EXISTS user_details_user_id_key;
+        ALTER TABLE user_details ADD CONSTRAINT user_details_pkey PRIMARY KEY (user_id);
+    """),
+    (4, "threshold indexes on credit_card_details", CATALOG_INDEXES),
+    (5, "per-card eligibility rules", """
+        CREATE TABLE IF NOT EXISTS credit_card_rules
+        (
+            credit_card VARCHAR(100) PRIMARY KEY,
+            rule JSONB NOT NULL
+        );
+    """),
+    (6, "credit_card_details credit history in months", CATALOG_HISTORY_TO_MONTHS),
+]
+
+_bootstrapped = False
+_bootstrap_lock = threading.Lock()
+
+
+def applied_versions(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations
+        (
+            version INT PRIMARY KEY,
+            description VARCHAR(200),
+            applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+    """)
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cursor.fetchall()}
+
+
+# Function to apply every pending migration, each in its own transaction.
+# Returns the versions that were applied.
+def migrate():
+    applied = []
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_KEY,))
+        try:
+            done = applied_versions(cursor)
+            conn.autocommit = False
+            for version, description, sql in MIGRATIONS:
+                if version in done:
+                    continue
+                try:
+                    cursor.execute(sql)
+                    cursor.execute("INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                                   (version, description))
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                applied.append(version)
+        finally:
+            conn.autocommit = True
+            cursor.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_KEY,))
+    return applied
+
+
+# Function to bring the schema up to date once per process (called at app startup)
+def bootstrap():
+    global _bootstrapped
+    if _bootstrapped:
+        return
+    with _bootstrap_lock:
+        if not _bootstrapped:
+            if db.DB_BACKEND == "sqlite":
+                import sqlite_backend
+                sqlite_backend.bootstrap()
+            else:
+                migrate()
+            _bootstrapped = True
+
+
+if __name__ == "__main__":
+    if "--status" in sys.argv:
+        with get_connection() as conn:
+            versions = applied_versions(conn.cursor())
+        for version, description, _ in MIGRATIONS:
+            print("{} {:>3}  {}".format("x" if version in versions else " ", version, description))
+    else:
+        print("Applied migrations: {}".format(migrate() or "none"))
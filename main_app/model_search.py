@@ -0,0 +1,193 @@
+# model_search.py
+#
+# k-fold cross-validation and hyperparameter search for the approval model.
+#
+#   python model_search.py                          grid over --l2 x categorical feature subsets
+#   python model_search.py --random 200 --folds 10  random search instead of the grid
+#   python model_search.py --save-best              retrain the winner on all rows and save it
+#
+# Candidates x folds are fitted on a process pool across all cores. The dataset is encoded
+# and split into stratified folds once; the matrices are stored as .npy files under the
+# dataset cache and memory-mapped by every worker (and reused by later runs on the same
+# data). The leaderboard, with accuracy, log loss, fit time and single-applicant inference
+# latency per candidate, is printed and written as CSV.
+
+import argparse
+import csv
+import itertools
+import multiprocessing
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import approval_model
+import dataset_cache
+import shared_cache
+from approval_model import CATEGORICAL_FEATURES, TARGET
+
+CV_CACHE_DIR = os.path.join(dataset_cache.CACHE_DIR, "cv")
+OUTPUT_DIR = os.path.join(approval_model.APP_DIR, "model_search")
+DEFAULT_L2 = (0.01, 0.1, 1.0, 10.0, 100.0)
+# Applicants scored one by one to measure inference latency
+LATENCY_SAMPLE = 200
+
+
+# Function to assign every row to one of `folds` folds, keeping the class balance in each
+def stratified_folds(y, folds, seed):
+    rng = np.random.default_rng(seed)
+    assignment = np.empty(len(y), dtype=np.int32)
+    for label in np.unique(y):
+        rows = rng.permutation(np.flatnonzero(y == label))
+        assignment[rows] = np.arange(len(rows)) % folds
+    return assignment
+
+
+# Function to encode the dataset and split it into folds, or reuse an earlier run's matrices.
+# Returns (cache name, generation).
+def prepare(dataset_path, folds, seed):
+    name = "cv-{}-k{}-s{}".format(dataset_cache.content_hash(dataset_path)[:16], folds, seed)
+    generation = shared_cache.current(name, CV_CACHE_DIR)
+    if generation is None:
+        frame = dataset_cache.load_dataset(dataset_path)
+        numeric, dummies, levels = approval_model.encode_features(frame)
+        y = frame[TARGET].to_numpy(dtype=float)
+        arrays = {"numeric": numeric, "dummies": dummies, "y": y, "fold": stratified_folds(y, folds, seed)}
+        generation = shared_cache.publish(name, arrays, {"levels": levels}, CV_CACHE_DIR)
+    return name, generation
+
+
+# Worker side: the encoded matrices and the raw rows, loaded once per process
+
+_data = None
+
+
+def _init_worker(name, generation, dataset_path):
+    global _data
+    arrays, metadata = shared_cache.load(name, generation, CV_CACHE_DIR)
+    _data = dict(arrays, levels=metadata["levels"], frame=dataset_cache.load_dataset(dataset_path))
+
+
+# Function to fit one candidate on all folds but `fold` and score it on `fold`
+def evaluate(candidate, fold):
+    train = _data["fold"] != fold
+    y = _data["y"]
+    started = time.perf_counter()
+    model = approval_model.fit_encoded(_data["numeric"][train], _data["dummies"][train], _data["levels"],
+                                       y[train], candidate["l2"], candidate["categorical_features"])
+    fit_seconds = time.perf_counter() - started
+
+    test = _data["frame"].iloc[np.flatnonzero(~train)]
+    p = np.clip(model.predict_frame(test), 1e-12, 1 - 1e-12)
+    actual = y[~train]
+    applicants = test.head(LATENCY_SAMPLE).to_dict("records")
+    started = time.perf_counter()
+    for applicant in applicants:
+        model.predict(applicant)
+    latency = (time.perf_counter() - started) / max(len(applicants), 1)
+    return {
+        "accuracy": float(((p >= 0.5) == (actual == 1)).mean()),
+        "log_loss": float(-(actual * np.log(p) + (1 - actual) * np.log(1 - p)).mean()),
+        "fit_ms": fit_seconds * 1000,
+        "latency_us": latency * 1e6,
+    }
+
+
+def feature_subsets():
+    return [subset for size in range(len(CATEGORICAL_FEATURES) + 1)
+            for subset in itertools.combinations(CATEGORICAL_FEATURES, size)]
+
+
+def grid_candidates(l2_values):
+    return [{"l2": l2, "categorical_features": list(subset)}
+            for l2 in l2_values for subset in feature_subsets()]
+
+
+def random_candidates(count, seed):
+    rng = random.Random(seed)
+    subsets = feature_subsets()
+    return [{"l2": 10 ** rng.uniform(-3, 3), "categorical_features": list(rng.choice(subsets))}
+            for _ in range(count)]
+
+
+# Function to cross-validate every candidate; returns leaderboard rows, best first
+def search(candidates, dataset_path, folds, seed, workers):
+    name, generation = prepare(dataset_path, folds, seed)
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=_init_worker, initargs=(name, generation, dataset_path))
+    with executor:
+        futures = {(index, fold): executor.submit(evaluate, candidate, fold)
+                   for index, candidate in enumerate(candidates) for fold in range(folds)}
+        scores = {key: future.result() for key, future in futures.items()}
+
+    leaderboard = []
+    for index, candidate in enumerate(candidates):
+        runs = [scores[index, fold] for fold in range(folds)]
+        accuracies = [run["accuracy"] for run in runs]
+        leaderboard.append({
+            "l2": candidate["l2"],
+            "categorical_features": "+".join(candidate["categorical_features"]) or "-",
+            "accuracy": statistics.mean(accuracies),
+            "accuracy_std": statistics.pstdev(accuracies),
+            "log_loss": statistics.mean(run["log_loss"] for run in runs),
+            "fit_ms": statistics.mean(run["fit_ms"] for run in runs),
+            "latency_us": statistics.median(run["latency_us"] for run in runs),
+        })
+    leaderboard.sort(key=lambda row: (-row["accuracy"], row["log_loss"]))
+    return leaderboard
+
+
+def print_leaderboard(leaderboard, limit=15):
+    print("{:>4} {:>9} {:<28} {:>9} {:>7} {:>9} {:>8} {:>11}".format(
+        "rank", "l2", "categorical features", "accuracy", "+/-", "log loss", "fit ms", "latency us"))
+    for rank, row in enumerate(leaderboard[:limit], 1):
+        print("{:>4} {:>9.4g} {:<28} {:>9.3f} {:>7.3f} {:>9.4f} {:>8.2f} {:>11.2f}".format(
+            rank, row["l2"], row["categorical_features"], row["accuracy"], row["accuracy_std"],
+            row["log_loss"], row["fit_ms"], row["latency_us"]))
+
+
+def write_leaderboard(leaderboard, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["rank"] + list(leaderboard[0]))
+        writer.writeheader()
+        for rank, row in enumerate(leaderboard, 1):
+            writer.writerow(dict(row, rank=rank))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-validated hyperparameter search for the approval model")
+    parser.add_argument("--dataset", default=approval_model.DATASET_PATH)
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--l2", type=float, nargs="+", default=DEFAULT_L2, help="grid values of the L2 penalty")
+    parser.add_argument("--random", type=int, metavar="N", help="sample N random candidates instead of the grid")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--output", default=os.path.join(OUTPUT_DIR, "leaderboard-{}.csv".format(
+        time.strftime("%Y%m%d-%H%M%S"))))
+    parser.add_argument("--save-best", action="store_true", help="retrain the best candidate and save it")
+    args = parser.parse_args()
+
+    candidates = random_candidates(args.random, args.seed) if args.random else grid_candidates(args.l2)
+    started = time.perf_counter()
+    leaderboard = search(candidates, args.dataset, args.folds, args.seed, args.workers)
+    print("{} candidates x {} folds in {:.1f}s on {} workers".format(
+        len(candidates), args.folds, time.perf_counter() - started, args.workers))
+    print_leaderboard(leaderboard)
+    write_leaderboard(leaderboard, args.output)
+    print("Leaderboard written to {}".format(args.output))
+
+    if args.save_best:
+        best = leaderboard[0]
+        features = [] if best["categorical_features"] == "-" else best["categorical_features"].split("+")
+        model = approval_model.train_model(dataset_cache.load_dataset(args.dataset), best["l2"], features)
+        approval_model.save_model(model)
+        print("Saved the best candidate (l2={:.4g}, {}) to {}".format(
+            best["l2"], best["categorical_features"], approval_model.MODEL_PATH))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# passwords.py
+#
+# pbkdf2 password hashing, run in a bounded pool of worker processes so that a
+# burst of logins does not serialise on the Streamlit script thread.
+
+import itertools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from passlib.hash import pbkdf2_sha256
+
+# pbkdf2 cost used for new hashes; stored hashes with a different cost are rehashed on login
+PBKDF2_ROUNDS = int(os.environ.get("PBKDF2_ROUNDS", pbkdf2_sha256.default_rounds))
+
+# Number of hashing processes; 0 hashes inline on the calling thread
+HASH_POOL_SIZE = int(os.environ.get("HASH_POOL_SIZE", os.cpu_count() or 1))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+# Worker side: these run inside the pool processes
+
+def _hash(password, rounds):
+    return pbkdf2_sha256.using(rounds=rounds).hash(password)
+
+
+def _verify(plain_password, hashed_password, rounds):
+    if not pbkdf2_sha256.verify(plain_password, hashed_password):
+        return False, None
+    if pbkdf2_sha256.from_string(hashed_password).rounds != rounds:
+        return True, _hash(plain_password, rounds)
+    return True, None
+
+
+# Function to get the hashing pool, started on first use
+def get_executor():
+    global _executor
+    if _executor is None and HASH_POOL_SIZE > 0:
+        with _executor_lock:
+            if _executor is None:
+                # spawn rather than fork: the Streamlit server process is multi-threaded
+                _executor = ProcessPoolExecutor(
+                    max_workers=HASH_POOL_SIZE, mp_context=multiprocessing.get_context("spawn"))
+    return _executor
+
+
+def _run(function, *args):
+    executor = get_executor()
+    if executor is None:
+        return function(*args)
+    return executor.submit(function, *args).result()
+
+
+# Function to hash passwords
+def hash_password(password, rounds=None):
+    return _run(_hash, password, rounds or PBKDF2_ROUNDS)
+
+
+# Function to hash many passwords across the pool; hashes come back in input order
+def hash_passwords(passwords, rounds=None):
+    rounds = rounds or PBKDF2_ROUNDS
+    executor = get_executor()
+    if executor is None:
+        return [_hash(password, rounds) for password in passwords]
+    # A few batches per process keeps the workers busy without paying IPC per password
+    chunksize = max(1, len(passwords) // (HASH_POOL_SIZE * 4))
+    return list(executor.map(_hash, passwords, itertools.repeat(rounds), chunksize=chunksize))
+
+
+# Function to verify a password and rehash it when the stored hash uses outdated parameters.
+# Returns (verified, new_hash); new_hash is None unless the stored hash should be replaced.
+def verify_and_update(plain_password, hashed_password, rounds=None):
+    return _run(_verify, plain_password, hashed_password, rounds or PBKDF2_ROUNDS)
+
+
+# Function to verify passwords
+def verify_password(plain_password, hashed_password):
+    verified, _ = verify_and_update(plain_password, hashed_password)
+    return verified
+
+
+# Function to stop the hashing pool
+def shutdown():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
@@ -0,0 +1,163 @@
+# preprocessing.py
+#
+# Convert raw UCI credit approval records (crx.csv / credit+approval/crx.data)
+# into the encoded layout of Final_dataset.csv.
+#
+#   python preprocessing.py ../crx.csv -o ../Final_dataset.csv --chunksize 100000
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Raw columns A1..A16 of crx.data, named after the Final_dataset.csv column they become
+RAW_COLUMNS = ("Gender", "Age", "Debt", "Married", "BankCustomer", "Industry", "Ethnicity",
+               "YearsEmployed", "PriorDefault", "Employed", "CreditScore", "DriversLicense",
+               "Citizen", "ZipCode", "Income", "Approved")
+
+RAW_CATEGORIES = {
+    "Gender": ["a", "b"],
+    "Married": ["u", "y", "l", "t"],
+    "BankCustomer": ["g", "p", "gg"],
+    "Industry": ["c", "d", "cc", "i", "j", "k", "m", "r", "q", "w", "x", "e", "aa", "ff"],
+    "Ethnicity": ["v", "h", "bb", "j", "n", "z", "dd", "ff", "o"],
+    "PriorDefault": ["t", "f"],
+    "Employed": ["t", "f"],
+    "DriversLicense": ["t", "f"],
+    "Citizen": ["g", "p", "s"],
+    "Approved": ["+", "-"],
+}
+
+# Raw code -> encoded value for each categorical column
+ENCODINGS = {
+    "Gender": {"a": 0, "b": 1},
+    "Married": {"u": 1, "y": 0, "l": 0, "t": 0},
+    "BankCustomer": {"g": 1, "gg": 1, "p": 0},
+    "Industry": {
+        "c": "Energy", "d": "Real Estate", "cc": "InformationTechnology", "i": "ConsumerDiscretionary",
+        "j": "Research", "k": "Financials", "m": "CommunicationServices", "r": "Transport",
+        "q": "Materials", "w": "Industrials", "x": "Utilities", "e": "Education",
+        "aa": "ConsumerStaples", "ff": "Healthcare",
+    },
+    "Ethnicity": {
+        "v": "White", "h": "Black", "bb": "Asian", "ff": "Latino",
+        "j": "Other", "n": "Other", "z": "Other", "dd": "Other", "o": "Other",
+    },
+    "PriorDefault": {"t": 1, "f": 0},
+    "Employed": {"t": 1, "f": 0},
+    "DriversLicense": {"t": 1, "f": 0},
+    "Citizen": {"g": "ByBirth", "s": "ByOtherMeans", "p": "Temporary"},
+    "Approved": {"+": 1, "-": 0},
+}
+
+# Fill values for "?" (modes of the categorical and medians of the numeric columns of the
+# reference dataset), fixed so that every chunk of a streamed file is imputed the same way.
+# A missing Approved label is not imputed; it stays missing (nullable Int64).
+MISSING_VALUES = {
+    "Gender": 1,
+    "Age": 28.46,
+    "Debt": 2.75,
+    "Married": 1,
+    "BankCustomer": 1,
+    "Industry": "Energy",
+    "Ethnicity": "White",
+    "YearsEmployed": 1.0,
+    "PriorDefault": 1,
+    "Employed": 0,
+    "CreditScore": 0,
+    "DriversLicense": 0,
+    "Citizen": "ByBirth",
+    "ZipCode": "00000",
+    "Income": 5,
+}
+
+RAW_DTYPES = dict(
+    {column: pd.CategoricalDtype(categories) for column, categories in RAW_CATEGORIES.items()},
+    Age=float, Debt=float, YearsEmployed=float, CreditScore=float, Income=float, ZipCode=str,
+)
+
+DEFAULT_CHUNKSIZE = 100000
+
+
+# Function to name the columns of a raw file from its first line: all 16 for labelled
+# records, the first 15 (no Approved) for unlabelled applications
+def raw_columns(path):
+    if hasattr(path, "readline"):
+        position = path.tell()
+        line = path.readline()
+        path.seek(position)
+    else:
+        with open(path) as f:
+            line = f.readline()
+    fields = len(line.rstrip("\r\n").split(","))
+    return list(RAW_COLUMNS if fields == len(RAW_COLUMNS) else RAW_COLUMNS[:-1])
+
+
+# Function to read raw records; returns an iterator of DataFrames when chunksize is given
+def read_raw(path, chunksize=None):
+    columns = raw_columns(path)
+    return pd.read_csv(path, header=None, names=columns,
+                       dtype={column: RAW_DTYPES[column] for column in columns},
+                       na_values=["?"], keep_default_na=False, chunksize=chunksize)
+
+
+# Function to encode one DataFrame of raw records into the Final_dataset.csv layout.
+# Categorical columns are encoded with one array lookup on their category codes;
+# code -1 ("?") picks the column's fill value stored at the end of the lookup array.
+def preprocess(raw):
+    result = pd.DataFrame(index=raw.index)
+    for column in RAW_COLUMNS:
+        if column not in raw:
+            continue  # e.g. unlabelled applications have no Approved column
+        values = raw[column]
+        if column in ENCODINGS:
+            codes = values.astype(RAW_DTYPES[column]).cat.codes.to_numpy()
+            lookup = [ENCODINGS[column][code] for code in RAW_CATEGORIES[column]]
+            lookup.append(MISSING_VALUES.get(column, pd.NA))
+            values = pd.Series(np.asarray(lookup, dtype=object)[codes], index=raw.index)
+        elif column in MISSING_VALUES:
+            values = values.fillna(MISSING_VALUES[column])
+        result[column] = values
+    for column in ("Gender", "Married", "BankCustomer", "PriorDefault", "Employed",
+                   "CreditScore", "DriversLicense", "Income"):
+        if column in result:
+            result[column] = result[column].astype(np.int64)
+    if "Approved" in result:
+        result["Approved"] = result["Approved"].astype("Int64")
+    for column in ("Industry", "Ethnicity", "Citizen"):
+        if column in result:
+            result[column] = result[column].astype("category")
+    if "ZipCode" in result:
+        result["ZipCode"] = result["ZipCode"].astype(str).str.zfill(5)
+    return result
+
+
+# Function to stream a raw file through preprocess() chunk by chunk, yielding encoded chunks
+def preprocess_chunks(path, chunksize=DEFAULT_CHUNKSIZE):
+    for chunk in read_raw(path, chunksize=chunksize):
+        yield preprocess(chunk)
+
+
+# Function to convert a raw file into a Final_dataset.csv-style file without loading it all at once
+def preprocess_file(src, dst, chunksize=DEFAULT_CHUNKSIZE):
+    rows = 0
+    for i, chunk in enumerate(preprocess_chunks(src, chunksize)):
+        chunk.to_csv(dst, mode="w" if i == 0 else "a", header=(i == 0), index=False)
+        rows += len(chunk)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Encode raw crx records into the Final_dataset.csv layout")
+    parser.add_argument("input", help="raw crx.data / crx.csv file")
+    parser.add_argument("-o", "--output", help="CSV file to write (default: stdout)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    args = parser.parse_args()
+
+    rows = preprocess_file(args.input, args.output or sys.stdout, args.chunksize)
+    print("Encoded {} records".format(rows), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+# query_trace.py
+#
+# Per-query instrumentation. With QUERY_TRACE=1, db.get_connection() hands out connections
+# whose cursors record, for every statement: a fingerprint of the SQL text, the duration,
+# the row count and the app function that ran it. Statements slower than SLOW_QUERY_MS are
+# logged as they happen; aggregate counters are available from stats() / report() and the
+# API server's /metrics endpoint. When disabled nothing is wrapped.
+
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+ENABLED = os.environ.get("QUERY_TRACE", "0").lower() in ("1", "true", "yes")
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", 100))
+
+logger = logging.getLogger("query_trace")
+
+# Frames from these files are plumbing, not the function that issued the query
+_PLUMBING_FILES = {"query_trace.py", "db.py", "sqlite_backend.py", "contextlib.py"}
+_POOL_METHODS = {"_run", "_query", "execute", "fetchone", "fetchall"}
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:%s|\?)\s*,)+\s*(?:%s|\?)\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+_stats = {}
+_stats_lock = threading.Lock()
+_local = threading.local()
+
+
+# Function to reduce a statement to its shape, so the same query with other values aggregates together
+def fingerprint(sql):
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    sql = _PLACEHOLDER_LIST.sub("(...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+# Context manager attributing queries run on this thread to `function`
+# (for work handed to a thread pool, whose stack no longer shows the caller)
+@contextmanager
+def calling(function):
+    _local.function = function
+    try:
+        yield
+    finally:
+        _local.function = None
+
+
+# Function to find the app function that issued the current query, e.g. "repository.get_user_details"
+def caller():
+    function = getattr(_local, "function", None)
+    if function:
+        return function
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = os.path.basename(frame.f_code.co_filename)
+        name = frame.f_code.co_name
+        if filename not in _PLUMBING_FILES and not (
+                filename == "async_repository.py" and name in _POOL_METHODS):
+            return "{}.{}".format(os.path.splitext(filename)[0], name)
+        frame = frame.f_back
+    return "unknown"
+
+
+def record(sql, duration, rowcount, function):
+    duration_ms = duration * 1000
+    key = fingerprint(sql)
+    with _stats_lock:
+        entry = _stats.get(key)
+        if entry is None:
+            entry = _stats[key] = {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0,
+                                   "slow": 0, "callers": {}}
+        entry["calls"] += 1
+        entry["total_ms"] += duration_ms
+        entry["max_ms"] = max(entry["max_ms"], duration_ms)
+        entry["rows"] += max(rowcount or 0, 0)
+        entry["callers"][function] = entry["callers"].get(function, 0) + 1
+        if duration_ms >= SLOW_QUERY_MS:
+            entry["slow"] += 1
+    if duration_ms >= SLOW_QUERY_MS:
+        logger.warning("Slow query (%.1f ms, %s rows) in %s: %s", duration_ms, rowcount, function, key)
+
+
+class TracingCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def _timed(self, method, sql, params):
+        function = caller()
+        started = time.perf_counter()
+        try:
+            result = method(sql, params)
+        finally:
+            record(sql, time.perf_counter() - started, getattr(self._cursor, "rowcount", None), function)
+        # sqlite_backend cursors return themselves from execute(); keep returning the wrapper
+        return self if result is self._cursor else result
+
+    def execute(self, sql, params=None):
+        return self._timed(self._cursor.execute, sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        return self._timed(self._cursor.executemany, sql, seq_of_params)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._cursor.close()
+
+
+class TracingConnection:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self, *args, **kwargs):
+        return TracingCursor(self._conn.cursor(*args, **kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        if name == "_conn":
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._conn, name, value)
+
+
+def wrap(conn):
+    return TracingConnection(conn) if ENABLED else conn
+
+
+# Aggregate counters, most expensive statements first
+def stats():
+    with _stats_lock:
+        entries = [dict(entry, query=query, callers=dict(entry["callers"]),
+                        avg_ms=entry["total_ms"] / entry["calls"])
+                   for query, entry in _stats.items()]
+    return sorted(entries, key=lambda entry: entry["total_ms"], reverse=True)
+
+
+def reset():
+    with _stats_lock:
+        _stats.clear()
+
+
+def report(limit=20):
+    lines = ["{:>7} {:>10} {:>9} {:>9} {:>5}  {}".format("calls", "total ms", "avg ms", "max ms", "slow", "query / callers")]
+    for entry in stats()[:limit]:
+        lines.append("{calls:>7} {total_ms:>10.1f} {avg_ms:>9.2f} {max_ms:>9.2f} {slow:>5}  {query}".format(**entry))
+        lines.append("{:>45}{}".format("", ", ".join(
+            "{} x{}".format(function, count) for function, count in entry["callers"].items())))
+    return "\n".join(lines)
+
+
+# Function to write the report to the log (e.g. at the end of a batch job)
+def log_report(limit=20):
+    if ENABLED:
+        logger.info("Query statistics\n%s", report(limit))
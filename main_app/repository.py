@@ -0,0 +1,169 @@
+# repository.py
+#
+# Data access for the profile and user_details tables.
+# Every write is a single statement: existence checks are folded into
+# ON CONFLICT / RETURNING clauses so a button press costs one round trip and
+# concurrent submits cannot create duplicate user_details rows. Committed
+# user_details writes are mirrored into the feature store (feature_store.py).
+
+import os
+
+from db import get_connection
+from passwords import hash_password, verify_password
+
+# Fields of the user record returned by get_user_record()
+USER_RECORD_FIELDS = ("id", "first_name", "last_name", "email_id", "password",
+                      "credit_score", "credit_limit", "credit_history", "income_requirement")
+
+# Set to keep per-user feature vectors in feature_store.py up to date
+FEATURE_STORE_ENABLED = bool(os.environ.get("FEATURE_STORE_DIR"))
+
+
+# Function to mirror a committed user_details write into the feature store; no values clears it
+
+def record_features(user_id, *credit_information):
+    if FEATURE_STORE_ENABLED:
+        # Imported lazily: it loads numpy and the model's feature lists
+        import feature_store
+        feature_store.record_credit_information(user_id, *credit_information)
+
+
+# Function to create a new user; False if the email id is already taken
+
+def create_user(first_name, last_name, email_id, new_password, address, phone_number):
+    # Look the email up first so a duplicate signup does not pay for a pbkdf2 hash;
+    # ON CONFLICT still covers two signups racing for the same email
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1 FROM profile WHERE email_id = %s", (email_id,))
+        if cursor.fetchone() is not None:
+            return False
+    # Hashed without holding a pooled connection
+    hashed_password = hash_password(new_password)
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                INSERT INTO profile (first_name, last_name, email_id, password, phone_number, address)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                ON CONFLICT (email_id) DO NOTHING
+                RETURNING id
+            """, (first_name, last_name, email_id, hashed_password, phone_number, address))
+            return cursor.fetchone() is not None
+
+        except Exception as e:
+            print(f"An error occurred: {e}")
+            return False
+
+
+# Function to fetch a user's profile and credit information with a single query
+
+def get_user_record(email_id):
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT p.id, p.first_name, p.last_name, p.email_id, p.password,
+                   u.minimum_credit_score, u.minimum_credit_limit,
+                   u.minimum_credit_history, u.minimum_income_requirement
+            FROM profile p
+            LEFT JOIN user_details u ON u.user_id = p.id
+            WHERE p.email_id = %s
+        """, (email_id,))
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    return dict(zip(USER_RECORD_FIELDS, row))
+
+
+def update_password_hash(user_id, hashed_password):
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("UPDATE profile SET password = %s WHERE id = %s", (hashed_password, user_id))
+
+
+def verify_credentials(email_id, password):
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT email_id, password FROM profile WHERE email_id = %s", (email_id,))
+        user_data = cursor.fetchone()
+
+    if user_data and verify_password(password, user_data[1]):
+        return True
+    else:
+        return False
+
+
+# Function to fetch user details based on email_id
+
+def get_user_details(email_id):
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM profile WHERE email_id = %s", (email_id,))
+        user_data = cursor.fetchone()
+    return user_data
+
+
+def retrive_credit_information(user_id):
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT * FROM user_details WHERE user_id = %s", (user_id,))
+        existing_user = cursor.fetchall()
+    return existing_user if existing_user else None
+
+
+# Function to insert a user's credit information; False if it was already inserted
+
+def create_credit_profile(user_id, credit_score, credit_limit, credit_history, income_requirement):
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO user_details (user_id, minimum_credit_score, minimum_credit_limit, minimum_credit_history, minimum_income_requirement)
+            VALUES (%s, %s, %s, %s, %s)
+            ON CONFLICT (user_id) DO NOTHING
+            RETURNING user_id
+        """, (user_id, credit_score, credit_limit, credit_history, income_requirement))
+        created = cursor.fetchone() is not None
+    if created:
+        record_features(user_id, credit_score, credit_limit, credit_history, income_requirement)
+    return created
+
+
+# Function to update user's credit information; False if the user has none yet
+
+def update_user_credit_information(user_id, updated_credit_score, updated_credit_limit, updated_credit_history, updated_income_requirement):
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                UPDATE user_details
+                SET minimum_credit_score = %s,
+                    minimum_credit_limit = %s,
+                    minimum_credit_history = %s,
+                    minimum_income_requirement = %s
+                WHERE user_id = %s
+                RETURNING user_id
+            """, (updated_credit_score, updated_credit_limit, updated_credit_history, updated_income_requirement, user_id))
+            updated = cursor.fetchone() is not None
+
+        except Exception as e:
+            print(f"An error occurred: {e}")
+            return False
+    if updated:
+        record_features(user_id, updated_credit_score, updated_credit_limit,
+                        updated_credit_history, updated_income_requirement)
+    return updated
+
+
+# Function to delete user's credit information; False if there was nothing to delete
+
+def delete_credit_information(user_id):
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "DELETE FROM user_details WHERE user_id = %s RETURNING user_id", (user_id,))
+        deleted = cursor.fetchone() is not None
+    if deleted:
+        record_features(user_id)
+    return deleted
@@ -0,0 +1,89 @@
+# shared_cache.py
+#
+# Read-only caches shared between the worker processes of a deployment (see deploy.py).
+# A cache is a set of NumPy arrays plus JSON metadata, written once as .npy files and
+# memory-mapped by every worker, so N workers share one copy in the page cache instead of
+# each holding their own. Publishing writes a new generation directory and then repoints
+# <name>.current atomically; readers compare generations to notice a refresh.
+#
+# Enabled by setting SHARED_CACHE_DIR.
+
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+SHARED_CACHE_DIR = os.environ.get("SHARED_CACHE_DIR")
+ENABLED = bool(SHARED_CACHE_DIR)
+
+# How often (seconds) workers look for a newer generation
+CHECK_INTERVAL = float(os.environ.get("SHARED_CACHE_CHECK_INTERVAL", 2))
+
+# Older generations kept on disk for workers that have not switched yet
+KEEP_GENERATIONS = 2
+
+
+def _pointer(name, directory):
+    return os.path.join(directory, name + ".current")
+
+
+# Function to get the generation currently published under `name`, or None
+def current(name, directory=None):
+    try:
+        with open(_pointer(name, directory or SHARED_CACHE_DIR)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+# Function to write `arrays` ({array name: ndarray}) and `metadata` as a new generation of `name`
+# and make it current. Returns the generation.
+def publish(name, arrays, metadata, directory=None):
+    directory = directory or SHARED_CACHE_DIR
+    os.makedirs(directory, exist_ok=True)
+    generation = "{}-{}-{}".format(name, int(time.time() * 1000), os.getpid())
+    path = os.path.join(directory, generation)
+    staging = path + ".tmp"
+    os.makedirs(staging)
+    for array_name, array in arrays.items():
+        np.save(os.path.join(staging, array_name + ".npy"), np.ascontiguousarray(array))
+    with open(os.path.join(staging, "metadata.json"), "w") as f:
+        json.dump(metadata, f)
+    os.rename(staging, path)
+
+    pointer = _pointer(name, directory)
+    with open(pointer + ".tmp", "w") as f:
+        f.write(generation)
+    os.replace(pointer + ".tmp", pointer)
+    _remove_old_generations(name, directory)
+    return generation
+
+
+# Function to memory-map a published generation; returns (arrays, metadata)
+def load(name, generation, directory=None):
+    path = os.path.join(directory or SHARED_CACHE_DIR, generation)
+    with open(os.path.join(path, "metadata.json")) as f:
+        metadata = json.load(f)
+    arrays = {}
+    for filename in os.listdir(path):
+        if filename.endswith(".npy"):
+            arrays[filename[:-4]] = np.load(os.path.join(path, filename), mmap_mode="r")
+    return arrays, metadata
+
+
+# Function to withdraw the current generation; the next reader rebuilds and republishes it
+def retire(name, directory=None):
+    try:
+        os.remove(_pointer(name, directory or SHARED_CACHE_DIR))
+    except FileNotFoundError:
+        pass
+
+
+def _remove_old_generations(name, directory):
+    # Workers still mapping a removed generation keep their mapping until they switch
+    generations = sorted(entry for entry in os.listdir(directory)
+                         if entry.startswith(name + "-") and not entry.endswith(".tmp"))
+    for generation in generations[:-KEEP_GENERATIONS]:
+        shutil.rmtree(os.path.join(directory, generation), ignore_errors=True)
@@ -0,0 +1,191 @@
+# sqlite_backend.py
+#
+# Embedded SQLite stand-in for the Postgres database, selected with DB_BACKEND=sqlite.
+# Connections translate the psycopg2 "%s" parameter style, so repository.py and the
+# rest of the app run unchanged against a local file for tests and benchmarks.
+
+import os
+import re
+import sqlite3
+import threading
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+SQLITE_PATH = os.environ.get("SQLITE_PATH", os.path.join(APP_DIR, "creditcard.sqlite3"))
+CATALOG_SEED_PATH = os.path.join(APP_DIR, "credit_card_details.sql")
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS profile
+    (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        first_name VARCHAR(100),
+        last_name VARCHAR(100),
+        email_id VARCHAR(100) NOT NULL UNIQUE,
+        password VARCHAR(100),
+        phone_number BIGINT NOT NULL,
+        address VARCHAR(100)
+    );
+    CREATE TABLE IF NOT EXISTS user_details
+    (
+        user_id INT PRIMARY KEY REFERENCES profile(id),
+        minimum_credit_score INT,
+        minimum_credit_limit INT,
+        minimum_credit_history INT,
+        minimum_income_requirement INT
+    );
+    CREATE TABLE IF NOT EXISTS credit_card_details
+    (
+        credit_card VARCHAR(100),
+        minimum_credit_score INT,
+        minimum_past_credit_limit INT,
+        minimum_credit_history INT,
+        minimum_income_requriement INT
+    );
+    CREATE INDEX IF NOT EXISTS credit_card_details_thresholds_idx ON credit_card_details
+        (minimum_credit_score, minimum_past_credit_limit, minimum_credit_history, minimum_income_requriement);
+    CREATE TABLE IF NOT EXISTS credit_card_rules
+    (
+        credit_card VARCHAR(100) PRIMARY KEY,
+        rule TEXT NOT NULL
+    );
+"""
+
+_ANY_PARAMETER = re.compile(r"=\s*ANY\(\s*%s\s*\)", re.IGNORECASE)
+
+_local = threading.local()
+
+
+# Function to rewrite a psycopg2-style statement and its parameters for sqlite3.
+# "= ANY(%s)" with a list parameter becomes "IN (?, ?, ...)".
+def translate(sql, params):
+    params = list(params or ())
+    if _ANY_PARAMETER.search(sql) is None:
+        return sql.replace("%s", "?"), params
+    pieces = re.split(r"(=\s*ANY\(\s*%s\s*\)|%s)", sql, flags=re.IGNORECASE)
+    out, flat, index = [], [], 0
+    for piece in pieces:
+        if piece == "%s":
+            out.append("?")
+            flat.append(params[index])
+            index += 1
+        elif _ANY_PARAMETER.fullmatch(piece):
+            values = list(params[index])
+            out.append("IN ({})".format(", ".join("?" * len(values)) or "NULL"))
+            flat.extend(values)
+            index += 1
+        else:
+            out.append(piece)
+    return "".join(out), flat
+
+
+class Cursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, sql, params=None):
+        self._cursor.execute(*translate(sql, params))
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        self._cursor.executemany(sql.replace("%s", "?"), seq_of_params)
+        return self
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetchmany(self, size):
+        return self._cursor.fetchmany(size)
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def close(self):
+        self._cursor.close()
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# sqlite3 connection with the subset of the psycopg2 connection API the app uses
+class Connection:
+    autocommit = True
+    closed = False
+
+    def __init__(self, conn):
+        self.raw = conn
+
+    def cursor(self):
+        return Cursor(self.raw.cursor())
+
+    def commit(self):
+        if self.raw.in_transaction:
+            self.raw.commit()
+
+    def rollback(self):
+        if self.raw.in_transaction:
+            self.raw.rollback()
+
+    def close(self):
+        self.raw.close()
+
+
+def connect(path=SQLITE_PATH):
+    # isolation_level=None: autocommit, like the pooled Postgres connections
+    conn = sqlite3.connect(path, isolation_level=None, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return Connection(conn)
+
+
+# Function to get this thread's connection (SQLite connections are cheap but not shareable)
+def get_connection():
+    conn = getattr(_local, "conn", None)
+    if conn is None or getattr(_local, "path", None) != SQLITE_PATH:
+        conn = _local.conn = connect(SQLITE_PATH)
+        _local.path = SQLITE_PATH
+    return conn
+
+
+# Function to load credit_card_details.sql into an empty catalog table.
+# Postgres rounds fractional values when storing them in INT columns; do the same.
+def seed_catalog(conn, path=CATALOG_SEED_PATH):
+    if conn.raw.execute("SELECT COUNT(*) FROM credit_card_details").fetchone()[0]:
+        return
+    with open(path, encoding="utf-8-sig") as f:
+        conn.raw.executescript("BEGIN;\n" + f.read() + "\nCOMMIT;")
+    conn.raw.execute("""
+        UPDATE credit_card_details
+        SET minimum_credit_score = CAST(ROUND(minimum_credit_score) AS INT),
+            minimum_past_credit_limit = CAST(ROUND(minimum_past_credit_limit) AS INT),
+            minimum_credit_history = CAST(ROUND(minimum_credit_history) AS INT),
+            minimum_income_requriement = CAST(ROUND(minimum_income_requriement) AS INT)
+    """)
+
+
+# Function to create the schema and seed the catalog (idempotent).
+# PRAGMA user_version 1 marks a catalog whose credit history is in months.
+def bootstrap(conn=None):
+    from migrations import CATALOG_HISTORY_TO_MONTHS
+
+    conn = conn or get_connection()
+    conn.raw.executescript(SCHEMA)
+    if conn.raw.execute("PRAGMA user_version").fetchone()[0] < 1:
+        if conn.raw.execute("SELECT COUNT(*) FROM credit_card_details").fetchone()[0]:
+            # Seeded from the old credit_card_details.sql, which stored years
+            conn.raw.executescript(CATALOG_HISTORY_TO_MONTHS)
+        conn.raw.execute("PRAGMA user_version = 1")
+    seed_catalog(conn)
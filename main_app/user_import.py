@@ -0,0 +1,293 @@
+# user_import.py
+#
+# Bulk onboarding of user accounts, e.g. customers migrated from a partner bank.
+#
+#   python user_import.py customers.csv
+#   python user_import.py customers.csv --chunksize 20000 --rejects rejected.csv
+#   python user_import.py customers.csv --rounds 1000    cheaper hashes, upgraded at first login
+#
+# The CSV needs first_name, last_name, email_id, password, phone_number and address columns;
+# rows that also have credit_score, credit_limit, credit_history and income_requirement get
+# their user_details row too. Emails are de-duplicated in memory, passwords are hashed
+# across the passwords.py process pool, and every chunk is COPYed into a temporary table
+# and inserted with ON CONFLICT in its own transaction. While one chunk is being written
+# the next one is hashed. Existing accounts are never modified.
+
+import argparse
+import csv
+import io
+import math
+import re
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import db
+import passwords
+from db import get_connection
+
+PROFILE_COLUMNS = ("first_name", "last_name", "email_id", "password", "phone_number", "address")
+DETAIL_COLUMNS = ("minimum_credit_score", "minimum_credit_limit", "minimum_credit_history",
+                  "minimum_income_requirement")
+
+# Other accepted header spellings
+HEADER_ALIASES = {
+    "email": "email_id",
+    "phone": "phone_number",
+    "credit_score": "minimum_credit_score",
+    "credit_limit": "minimum_credit_limit",
+    "credit_history": "minimum_credit_history",
+    "income_requirement": "minimum_income_requirement",
+    "income": "minimum_income_requirement",
+}
+
+DEFAULT_CHUNKSIZE = 10000
+MAX_TEXT_LENGTH = 100
+# Largest value of the user_details INT columns and of profile.phone_number (BIGINT)
+MAX_INTEGER = 2 ** 31 - 1
+MAX_PHONE_NUMBER = 2 ** 63 - 1
+EMAIL = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+class RowError(ValueError):
+    pass
+
+
+def _text(row, column, required=False):
+    value = (row.get(column) or "").strip()
+    if required and not value:
+        raise RowError("{} is empty".format(column))
+    if len(value) > MAX_TEXT_LENGTH:
+        raise RowError("{} is longer than {} characters".format(column, MAX_TEXT_LENGTH))
+    return value
+
+
+def _integer(row, column):
+    value = (row.get(column) or "").strip().replace(",", "")
+    try:
+        number = float(value)
+    except ValueError:
+        raise RowError("{} is not a number: {!r}".format(column, value))
+    # float() also accepts "nan" and "inf", which must not reach int() or the database
+    if not math.isfinite(number):
+        raise RowError("{} is not a number: {!r}".format(column, value))
+    number = int(number)
+    if number < 0:
+        raise RowError("{} must be non-negative: {!r}".format(column, value))
+    if number > MAX_INTEGER:
+        raise RowError("{} is out of range: {!r}".format(column, value))
+    return number
+
+
+# Function to validate one CSV row; returns (profile values with the plain password, details or None)
+def parse_row(row):
+    email_id = _text(row, "email_id", required=True)
+    if not EMAIL.match(email_id):
+        raise RowError("email_id is not an email address")
+    password = row.get("password") or ""
+    if not password:
+        raise RowError("password is empty")
+    phone = re.sub(r"[\s()+.-]", "", row.get("phone_number") or "")
+    # ASCII digits only: str.isdigit() also accepts e.g. "²", which int() rejects
+    if not re.fullmatch(r"[0-9]+", phone):
+        raise RowError("phone_number is not a number")
+    if int(phone) > MAX_PHONE_NUMBER:
+        raise RowError("phone_number is too long")
+    profile = (_text(row, "first_name"), _text(row, "last_name"), email_id, password, int(phone),
+               _text(row, "address"))
+    present = [bool((row.get(column) or "").strip()) for column in DETAIL_COLUMNS]
+    if not any(present):
+        return profile, None
+    if not all(present):
+        raise RowError("credit details are incomplete")
+    return profile, tuple(_integer(row, column) for column in DETAIL_COLUMNS)
+
+
+# Function to read the CSV in chunks of valid, de-duplicated rows as (line, profile, details).
+# Rejected rows are appended to `rejects` as (line, email_id, reason).
+def read_chunks(path, chunksize, rejects):
+    seen = {}
+    chunk = []
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = [HEADER_ALIASES.get(name.strip().lower(), name.strip().lower()) for name in next(reader)]
+        missing = [column for column in PROFILE_COLUMNS if column not in header]
+        if missing:
+            raise SystemExit("Missing columns: {}".format(", ".join(missing)))
+        for line, values in enumerate(reader, start=2):
+            if not any(value.strip() for value in values):
+                continue
+            row = dict(zip(header, values))
+            try:
+                profile, details = parse_row(row)
+            except RowError as e:
+                rejects.append((line, row.get("email_id", ""), str(e)))
+                continue
+            key = profile[2].lower()
+            if key in seen:
+                rejects.append((line, profile[2], "duplicate of line {}".format(seen[key])))
+                continue
+            seen[key] = line
+            chunk.append((line, profile, details))
+            if len(chunk) >= chunksize:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+# Function to write one chunk in a single transaction (Postgres): COPY into a temporary table,
+# then insert new profiles and their credit details. Returns (inserted email ids, details rows).
+def load_chunk_postgres(records):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(profile + (details or (None,) * len(DETAIL_COLUMNS))
+                                 for profile, details in records)
+    buffer.seek(0)
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        conn.autocommit = False
+        try:
+            cursor.execute("""
+                CREATE TEMP TABLE profile_import
+                (
+                    first_name VARCHAR(100),
+                    last_name VARCHAR(100),
+                    email_id VARCHAR(100),
+                    password VARCHAR(100),
+                    phone_number BIGINT,
+                    address VARCHAR(100),
+                    minimum_credit_score INT,
+                    minimum_credit_limit INT,
+                    minimum_credit_history INT,
+                    minimum_income_requirement INT
+                ) ON COMMIT DROP
+            """)
+            cursor.copy_expert("COPY profile_import FROM STDIN WITH (FORMAT csv)", buffer)
+            cursor.execute("""
+                WITH inserted AS (
+                    INSERT INTO profile (first_name, last_name, email_id, password, phone_number, address)
+                    SELECT first_name, last_name, email_id, password, phone_number, address FROM profile_import
+                    ON CONFLICT (email_id) DO NOTHING
+                    RETURNING id, email_id
+                ), details AS (
+                    INSERT INTO user_details (user_id, minimum_credit_score, minimum_credit_limit,
+                                              minimum_credit_history, minimum_income_requirement)
+                    SELECT i.id, s.minimum_credit_score, s.minimum_credit_limit,
+                           s.minimum_credit_history, s.minimum_income_requirement
+                    FROM inserted i
+                    JOIN profile_import s ON s.email_id = i.email_id
+                    WHERE s.minimum_credit_score IS NOT NULL
+                    ON CONFLICT (user_id) DO NOTHING
+                    RETURNING user_id
+                )
+                SELECT (SELECT array_agg(email_id) FROM inserted), (SELECT count(*) FROM details)
+            """)
+            emails, details = cursor.fetchone()
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.autocommit = True
+    return set(emails or ()), details
+
+
+# Same as load_chunk_postgres() for the SQLite backend
+def load_chunk_sqlite(records):
+    inserted, details_rows = set(), []
+    with get_connection() as conn:
+        raw = conn.raw
+        raw.execute("BEGIN")
+        try:
+            for profile, details in records:
+                row = raw.execute("""
+                    INSERT INTO profile (first_name, last_name, email_id, password, phone_number, address)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (email_id) DO NOTHING
+                    RETURNING id
+                """, profile).fetchone()
+                if row is None:
+                    continue
+                inserted.add(profile[2])
+                if details is not None:
+                    details_rows.append((row[0],) + details)
+            raw.executemany("INSERT INTO user_details VALUES (?, ?, ?, ?, ?) ON CONFLICT (user_id) DO NOTHING",
+                            details_rows)
+            raw.execute("COMMIT")
+        except Exception:
+            raw.execute("ROLLBACK")
+            raise
+    return inserted, len(details_rows)
+
+
+def load_chunk(records):
+    if db.DB_BACKEND == "sqlite":
+        return load_chunk_sqlite(records)
+    return load_chunk_postgres(records)
+
+
+# Function to import a CSV of profiles; returns a dict of counters and the rejected rows
+def import_users(path, chunksize=DEFAULT_CHUNKSIZE, rounds=None):
+    rejects = []
+    report = {"imported": 0, "details": 0, "hash_seconds": 0.0}
+    started = time.perf_counter()
+
+    def collect(chunk, future):
+        emails, details = future.result()
+        report["imported"] += len(emails)
+        report["details"] += details
+        for line, profile, _ in chunk:
+            if profile[2] not in emails:
+                rejects.append((line, profile[2], "email already registered"))
+
+    # One writer thread: the next chunk is hashed while the previous one is written
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        pending = None
+        for chunk in read_chunks(path, chunksize, rejects):
+            hash_started = time.perf_counter()
+            hashes = passwords.hash_passwords([profile[3] for _, profile, _ in chunk], rounds)
+            report["hash_seconds"] += time.perf_counter() - hash_started
+            records = [(profile[:3] + (hashed,) + profile[4:], details)
+                       for (_, profile, details), hashed in zip(chunk, hashes)]
+            if pending is not None:
+                collect(*pending)
+            pending = (chunk, writer.submit(load_chunk, records))
+        if pending is not None:
+            collect(*pending)
+
+    report["seconds"] = time.perf_counter() - started
+    report["rejected"] = len(rejects)
+    return report, sorted(rejects)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import user profiles from a CSV file")
+    parser.add_argument("path")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="rows per transaction")
+    parser.add_argument("--rounds", type=int, help="pbkdf2 rounds (default: passwords.PBKDF2_ROUNDS)")
+    parser.add_argument("--hash-workers", type=int, help="hashing processes (default: HASH_POOL_SIZE)")
+    parser.add_argument("--rejects", help="write rejected rows to this CSV file")
+    args = parser.parse_args()
+
+    if args.hash_workers is not None:
+        passwords.HASH_POOL_SIZE = args.hash_workers
+    try:
+        report, rejects = import_users(args.path, args.chunksize, args.rounds)
+    finally:
+        passwords.shutdown()
+
+    print("Imported {imported} profiles ({details} with credit details), rejected {rejected} rows".format(**report))
+    print("{:.1f}s total, {:.1f}s hashing, {:.0f} profiles/s".format(
+        report["seconds"], report["hash_seconds"], report["imported"] / max(report["seconds"], 1e-9)))
+    for reason, count in Counter(re.split(r":| of line", reason)[0] for _, _, reason in rejects).most_common():
+        print("  {:>8}  {}".format(count, reason))
+    if args.rejects:
+        with open(args.rejects, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(("line", "email_id", "reason"))
+            writer.writerows(rejects)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+# The app's modules live flat in main_app/ and import each other by plain name
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main_app"))
@@ -0,0 +1,48 @@
+import asyncio
+import json
+
+import pytest
+import tornado.httpclient
+import tornado.httpserver
+import tornado.netutil
+
+import api_server
+
+
+# Function to POST JSON bodies to a fresh server; returns [(status, decoded body), ...]
+def post_all(path, bodies):
+    async def run():
+        sockets = tornado.netutil.bind_sockets(0, "127.0.0.1")
+        server = tornado.httpserver.HTTPServer(api_server.make_app())
+        server.add_sockets(sockets)
+        client = tornado.httpclient.AsyncHTTPClient()
+        url = "http://127.0.0.1:{}{}".format(sockets[0].getsockname()[1], path)
+        responses = []
+        for body in bodies:
+            response = await client.fetch(url, method="POST", body=json.dumps(body), raise_error=False)
+            responses.append((response.code, json.loads(response.body)))
+        server.stop()
+        return responses
+    return asyncio.run(run())
+
+
+def test_non_finite_thresholds_are_rejected():
+    bodies = [dict(credit_score=value, credit_limit=1000, credit_history=12, income_requirement=30000)
+              for value in ("NaN", "Infinity", "-inf", float("nan"), float("inf"))]
+    for code, body in post_all("/eligibility", bodies):
+        assert code == 400
+        assert body["error"] == "Threshold fields must be finite numbers"
+
+
+def test_batch_applicants_must_be_objects():
+    bodies = [{"applicants": applicants} for applicants in ([1, 2], [[700, 1, 1, 1]], ["x"], [None])]
+    for code, body in post_all("/eligibility/batch", bodies):
+        assert code == 400
+        assert body["error"] == "Applicants must be JSON objects"
+
+
+@pytest.mark.parametrize("data", [[1, 2, 3, 4], {"credit_score": "1e999", "credit_limit": 1,
+                                                  "credit_history": 1, "income_requirement": 1}])
+def test_parse_thresholds_rejects(data):
+    with pytest.raises(api_server.BadRequest):
+        api_server.parse_thresholds(data)
@@ -0,0 +1,24 @@
+import warnings
+
+import pandas as pd
+import pytest
+
+from approval_model import ApprovalModel
+
+MODEL = ApprovalModel(0.5, {"Age": 0.1, "Income": 1.0}, {"Age": 30.0, "Income": 5.0},
+                      {"Citizen": {"ByBirth": 0.2}})
+
+
+@pytest.mark.parametrize("age, expected", [(-1e300, 0.0), (1e300, 1.0), (-1e5, 0.0), (1e5, 1.0)])
+def test_extreme_inputs_do_not_overflow(age, expected):
+    assert MODEL.predict({"Age": age}) == pytest.approx(expected)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert MODEL.predict_frame(pd.DataFrame({"Age": [age]}))[0] == pytest.approx(expected)
+
+
+def test_predict_matches_predict_frame():
+    applicants = [{"Age": 22.5, "Income": 300, "Citizen": "ByBirth"}, {"Age": 60, "Citizen": "Temporary"}, {}]
+    frame = pd.DataFrame(applicants)
+    expected = [MODEL.predict(applicant) for applicant in applicants]
+    assert MODEL.predict_frame(frame).tolist() == pytest.approx(expected)
@@ -0,0 +1,59 @@
+import asyncio
+
+import psycopg2
+
+import async_repository
+
+
+class FakeConnection:
+    closed = False
+    executing = False
+
+    def close(self):
+        self.closed = True
+
+    def isexecuting(self):
+        return self.executing
+
+
+def use_connection(body):
+    pool = async_repository.AsyncPool(max_size=1, dbname="unused")
+    conn = FakeConnection()
+
+    async def connect():
+        return conn
+    pool._connect = connect
+
+    async def run():
+        async with pool.connection() as borrowed:
+            await body(borrowed)
+
+    async def main():
+        task = asyncio.create_task(run())
+        await asyncio.sleep(0)
+        task.cancel()
+        try:
+            await task
+        except (asyncio.CancelledError, psycopg2.Error):
+            pass
+    asyncio.run(main())
+    return pool, conn
+
+
+def test_cancelled_query_closes_the_connection():
+    async def body(conn):
+        conn.executing = True
+        await asyncio.sleep(10)
+
+    pool, conn = use_connection(body)
+    assert conn.closed
+    assert pool._idle == []
+
+
+def test_failed_statement_keeps_the_connection():
+    async def body(conn):
+        raise psycopg2.IntegrityError("duplicate key")
+
+    pool, conn = use_connection(body)
+    assert not conn.closed
+    assert pool._idle == [conn]
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+import eligibility_rules
+from card_catalog import CardCatalog
+
+FIELD_SCALES = (600, 5000, 24, 50000)
+
+
+def random_rule(rng, depth=0):
+    kind = rng.integers(0, 5 if depth < 3 else 2)
+    if kind == 0:
+        return "thresholds"
+    if kind == 1:
+        index = rng.integers(len(eligibility_rules.FIELDS))
+        bound = FIELD_SCALES[index] * rng.uniform(0.5, 1.5)
+        rule = {"field": eligibility_rules.FIELDS[index]}
+        if rng.random() < 0.8:
+            rule["min"] = round(bound)
+        if rng.random() < 0.5:
+            rule["max"] = round(bound * 1.4)
+        return rule
+    if kind == 2:
+        return {"not": random_rule(rng, depth + 1)}
+    return {("all", "any")[kind - 3]: [random_rule(rng, depth + 1) for _ in range(rng.integers(0, 3))]}
+
+
+def random_catalog(rng, cards=40):
+    thresholds = rng.uniform(0.3, 1.2, (cards, 4)) * FIELD_SCALES
+    thresholds[rng.random((cards, 4)) < 0.05] = np.nan
+    rules = {}
+    for card in range(0, cards, 2):
+        while True:
+            rule = random_rule(rng)
+            try:
+                eligibility_rules.to_clauses(rule, np.zeros(4))
+            except eligibility_rules.RuleError:
+                continue
+            rules["card {}".format(card)] = rule
+            break
+    return CardCatalog(["card {}".format(card) for card in range(cards)], np.round(thresholds), rules)
+
+
+def random_values(rng):
+    values = np.round(rng.uniform(0, 1.6, 4) * FIELD_SCALES)
+    # Some values sit exactly on a bound
+    values[rng.random(4) < 0.1] = 0
+    # and some are not finite, which never qualifies
+    values[rng.random(4) < 0.03] = rng.choice([np.nan, np.inf, -np.inf])
+    return tuple(values.tolist())
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_mask_matrix_and_ranking_agree(seed):
+    rng = np.random.default_rng(seed)
+    catalog = random_catalog(rng)
+    previous = random_values(rng)
+    mask = catalog.eligible_mask(*previous)
+    for _ in range(300):
+        values = random_values(rng)
+        expected = catalog.eligible_mask(*values)
+        assert (catalog.eligibility_matrix([values])[0] == expected).all()
+        mask, _ = catalog.update_mask(mask, previous, values)
+        assert (mask == expected).all()
+        ranked = catalog.ranked_eligibility(*values)
+        assert {r["credit_card"] for r in ranked if r["eligible"]} == set(np.asarray(catalog.names)[expected])
+        assert catalog.ranked_eligibility(*values, mask=mask) == ranked
+        assert (catalog.ranked_eligibility(*values, near_miss_tolerance=0.5, mask=mask)
+                == catalog.ranked_eligibility(*values, near_miss_tolerance=0.5))
+        previous = values
+
+
+def test_negated_range_at_its_edge():
+    # The second card widens the credit score spread, so a 5e-324 miss rounds to 0 when scaled
+    catalog = CardCatalog(["card", "other"], [[0, 0, 0, 0], [800, 0, 0, 0]],
+                          {"card": {"not": {"field": "credit_score", "min": 0, "max": 1}}})
+    assert not catalog.eligible_mask(0, 0, 0, 0)[0]
+    assert not catalog.eligibility_matrix([[0, 0, 0, 0]])[0, 0]
+    assert all(not result["eligible"] for result in catalog.ranked_eligibility(0, 0, 0, 0))
+    assert catalog.eligible_mask(2, 0, 0, 0)[0]
+    assert catalog.ranked_eligibility(2, 0, 0, 0)[0]["eligible"]
+
+
+def test_default_rule_is_the_thresholds():
+    catalog = CardCatalog(["a", "b"], [[700, 5000, 12, 45000], [600, np.nan, 0, 0]])
+    assert catalog.eligible_cards(700, 5000, 12, 45000) == [("a",)]
+    assert catalog.eligible_cards(650, 10**6, 100, 10**6) == []
+
+
+def test_rules_match_padded_card_names():
+    catalog = CardCatalog(["Platinum  Card          ", "Gold Card"], [[0, 0, 0, 0], [0, 0, 0, 0]],
+                          {" Platinum Card": {"field": "credit_score", "min": 700}})
+    assert catalog.eligible_cards(650, 0, 0, 0) == [("Gold Card",)]
+    assert eligibility_rules.normalise_name("  American   Express\tCard  ") == "American Express Card"
@@ -0,0 +1,56 @@
+import pandas as pd
+
+import dataset_cache
+
+LABELLED = "b,30.83,0,u,g,w,v,1.25,t,t,01,f,g,00202,0,+\n"
+
+
+def test_convert_writes_every_chunk(tmp_path):
+    frame = pd.DataFrame({"a": range(25), "b": [i / 2 for i in range(25)], "c": ["x", "y", "z", "w", "v"] * 5})
+    csv_path = tmp_path / "data.csv"
+    frame.to_csv(csv_path, index=False)
+    arrow_path = str(tmp_path / "data.arrow")
+    dataset_cache.convert(str(csv_path), arrow_path, dataset_cache.read_csv, chunksize=10)
+    pd.testing.assert_frame_equal(
+        dataset_cache.pa.ipc.open_file(dataset_cache.pa.memory_map(arrow_path)).read_all().to_pandas(), frame)
+
+
+def convert_text(tmp_path, text, chunksize=2):
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_text(text)
+    arrow_path = str(tmp_path / "data.arrow")
+    dataset_cache.convert(str(csv_path), arrow_path, dataset_cache.read_csv, chunksize=chunksize)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["data.arrow", "data.csv"]
+    return dataset_cache.pa.ipc.open_file(dataset_cache.pa.memory_map(arrow_path)).read_all()
+
+
+def test_convert_keeps_first_chunk_types(tmp_path):
+    # The second chunk alone would be inferred as int64
+    table = convert_text(tmp_path, "value\n1.5\n2.5\n3\n4\n")
+    assert table.column("value").to_pylist() == [1.5, 2.5, 3.0, 4.0]
+
+
+def test_convert_widens_for_later_chunks(tmp_path):
+    table = convert_text(tmp_path, "value\n1\n2\n3.5\n")
+    assert table.column("value").to_pylist() == [1.0, 2.0, 3.5]
+    assert table.to_pandas()["value"].dtype == "float64"
+
+
+def test_convert_stores_mixed_columns_as_text(tmp_path):
+    table = convert_text(tmp_path, "value,other\n,1\n,2\nabc,3\n4,4\n")
+    assert table.column("value").to_pylist() == [None, None, "abc", "4"]
+    assert table.column("other").to_pylist() == [1, 2, 3, 4]
+
+
+def test_convert_empty_file(tmp_path):
+    assert convert_text(tmp_path, "value\n").num_rows == 0
+
+
+def test_raw_records_in_several_chunks(tmp_path):
+    raw_path = tmp_path / "crx.csv"
+    raw_path.write_text(LABELLED * 10)
+    arrow_path = str(tmp_path / "crx.arrow")
+    dataset_cache.convert(str(raw_path), arrow_path, dataset_cache.read_raw_crx, chunksize=4)
+    frame = dataset_cache.pa.ipc.open_file(dataset_cache.pa.memory_map(arrow_path)).read_all().to_pandas()
+    assert len(frame) == 10
+    assert frame["Industry"].tolist() == ["w"] * 10
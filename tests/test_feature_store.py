@@ -0,0 +1,81 @@
+import json
+
+import numpy as np
+import pytest
+
+import feature_store
+from approval_model import ApprovalModel
+
+
+def test_failed_update_invalidates_the_old_thresholds(tmp_path, monkeypatch):
+    store = feature_store.FeatureStore(str(tmp_path))
+    monkeypatch.setattr(feature_store, "_store", store)
+    feature_store.record_credit_information(7, 700, 5000, 24, 45000)
+    assert store.thresholds(7) == (700.0, 5000.0, 24.0, 45000.0)
+
+    def fail(user_id, **values):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(store, "put", fail)
+    feature_store.record_credit_information(7, 650, 4000, 12, 30000)
+    assert store.thresholds(7) == (None, None, None, None)
+
+
+def test_invalidating_an_unknown_user_is_a_no_op(tmp_path):
+    store = feature_store.FeatureStore(str(tmp_path))
+    store.invalidate(7)
+    assert store.thresholds(7) is None
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=None):
+        pass
+
+    def fetchall(self):
+        return self.rows
+
+
+def test_rebuild_after_the_columns_changed(tmp_path, monkeypatch):
+    # A store written when the columns were the thresholds, Age and a since removed feature
+    old_columns = feature_store.THRESHOLD_COLUMNS + ("Age", "Removed")
+    (tmp_path / "columns.json").write_text(json.dumps(old_columns))
+    np.array([[1, 2, 3, 4, 31.5, 9], [5, 6, 7, 8, 40, 9]], dtype=np.float64).tofile(tmp_path / "features.f64")
+    np.array([7, 8], dtype=np.int64).tofile(tmp_path / "user_ids.i64")
+    with pytest.raises(ValueError, match="--rebuild"):
+        feature_store.FeatureStore(str(tmp_path))
+
+    monkeypatch.setattr(feature_store, "get_connection", lambda: FakeConnection([(7, 700, 5000, 24, 45000)]))
+    assert feature_store.rebuild(str(tmp_path)) == 1
+    store = feature_store.FeatureStore(str(tmp_path))
+    assert store.thresholds(7) == (700.0, 5000.0, 24.0, 45000.0)
+    assert store.attributes(7) == {"Age": 31.5}
+    assert store.thresholds(8) is None
+
+
+def test_attributes_loaded_from_csv_are_scored(tmp_path, monkeypatch):
+    store = feature_store.FeatureStore(str(tmp_path / "store"))
+    monkeypatch.setattr(feature_store, "_store", store)
+    feature_store.record_credit_information(7, 700, 5000, 24, 45000)
+    csv_path = tmp_path / "applicants.csv"
+    csv_path.write_text("user_id,Age,Income,Industry,Citizen,Approved,ZipCode\n"
+                        "7,31.5,560,Energy,ByBirth,1,00202\n"
+                        "8,,0,Materials,,0,00043\n")
+    assert feature_store.load_attributes(str(csv_path), chunksize=1) == 2
+    assert store.thresholds(7) == (700.0, 5000.0, 24.0, 45000.0)
+    assert store.attributes(7) == {"Age": 31.5, "Income": 560.0, "Industry": "Energy", "Citizen": "ByBirth"}
+    assert store.attributes(8) == {"Income": 0.0, "Industry": "Materials"}
+    model = ApprovalModel(0.0, {"Age": 0.1, "Income": 0.0}, {"Age": 30.0, "Income": 0.0},
+                          {"Industry": {"Energy": 1.0}})
+    assert model.predict(store.attributes(7)) == model.predict({"Age": 31.5, "Industry": "Energy"})
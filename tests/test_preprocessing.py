@@ -0,0 +1,51 @@
+import io
+
+import preprocessing
+
+LABELLED = "b,30.83,0,u,g,w,v,1.25,t,t,01,f,g,00202,0,+\n"
+UNLABELLED = "a,58.67,4.46,u,g,q,h,3.04,t,t,06,f,g,00043,560\n"
+MISSING = "?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?\n"
+
+
+def encode(text):
+    return preprocessing.preprocess(preprocessing.read_raw(io.StringIO(text)))
+
+
+def test_labelled_row():
+    row = encode(LABELLED).iloc[0]
+    assert row["Gender"] == 1
+    assert row["Industry"] == "Industrials"
+    assert row["CreditScore"] == 1
+    assert row["Approved"] == 1
+
+
+def test_unlabelled_rows_have_no_approved_column(tmp_path):
+    path = tmp_path / "applications.csv"
+    path.write_text(UNLABELLED * 3)
+    result = preprocessing.preprocess(preprocessing.read_raw(str(path)))
+    assert "Approved" not in result
+    assert len(result) == 3
+    assert result["Income"].tolist() == [560] * 3
+
+
+def test_question_marks_use_fill_values():
+    row = encode(MISSING).iloc[0]
+    for column, value in preprocessing.MISSING_VALUES.items():
+        assert row[column] == value, column
+    assert row["Approved"] is preprocessing.pd.NA
+
+
+def test_question_marks_in_unlabelled_rows():
+    result = encode(UNLABELLED + MISSING[:-3] + "\n")
+    assert result["PriorDefault"].tolist() == [1, 1]
+    assert result["Income"].tolist() == [560, 5]
+    assert result["CreditScore"].dtype == "int64"
+
+
+def test_chunked_file_matches_single_pass(tmp_path):
+    path = tmp_path / "crx.csv"
+    path.write_text((LABELLED + MISSING) * 5)
+    chunks = list(preprocessing.preprocess_chunks(str(path), chunksize=3))
+    whole = encode((LABELLED + MISSING) * 5)
+    assert sum(len(chunk) for chunk in chunks) == len(whole)
+    assert [chunk["Income"].tolist() for chunk in chunks][0] == whole["Income"].tolist()[:3]
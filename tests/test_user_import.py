@@ -0,0 +1,34 @@
+import pytest
+
+from user_import import RowError, parse_row
+
+ROW = {"first_name": "Ada", "last_name": "Byron", "email_id": "ada@example.com", "password": "secret",
+       "phone_number": "555 0100", "address": "1 Main St", "minimum_credit_score": "700",
+       "minimum_credit_limit": "5,000", "minimum_credit_history": "24.0", "minimum_income_requirement": "45000"}
+
+
+def test_credit_details_are_parsed():
+    profile, details = parse_row(ROW)
+    assert profile[2] == "ada@example.com"
+    assert details == (700, 5000, 24, 45000)
+
+
+@pytest.mark.parametrize("value", ["inf", "-inf", "1e400", "nan", "NaN", "2147483648", "-1", "-2147483649", "abc"])
+def test_bad_numbers_reject_the_row(value):
+    with pytest.raises(RowError):
+        parse_row(dict(ROW, minimum_income_requirement=value))
+
+
+def test_int_bounds_are_accepted():
+    details = parse_row(dict(ROW, minimum_credit_limit="2147483647", minimum_credit_history="0"))[1]
+    assert details[1:3] == (2147483647, 0)
+
+
+@pytest.mark.parametrize("phone", ["²", "555 ０100", "12345678901234567890123456", "9223372036854775808", ""])
+def test_bad_phone_numbers_reject_the_row(phone):
+    with pytest.raises(RowError):
+        parse_row(dict(ROW, phone_number=phone))
+
+
+def test_phone_number_up_to_bigint():
+    assert parse_row(dict(ROW, phone_number="+9 (223) 372-036-854.775807"))[0][4] == 2 ** 63 - 1